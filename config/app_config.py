@@ -55,6 +55,7 @@ class AppConfig:
     SIDEBAR_WIDTH = 300
     CHART_HEIGHT = 400
     TABLE_HEIGHT = 600
+    MAX_PLOT_POINTS = 2000  # Row cap for charts drawn from full query results
     
     # Colors and Styling
     PRIMARY_COLOR = "#FF6B35"
@@ -105,11 +106,22 @@ class DatabaseConfig:
     CONNECTION_TIMEOUT = 30
     MAX_CONNECTIONS = 10
     
+    # PRAGMAs for the read-heavy SQL analytics workload: WAL without per-commit
+    # fsyncs, in-memory temp tables, up to 1GB of memory-mapped I/O and a 64MB page cache
+    ANALYTICS_PRAGMAS = (
+        "journal_mode=WAL",
+        "synchronous=NORMAL",
+        "temp_store=MEMORY",
+        "mmap_size=1073741824",
+        "cache_size=-65536",
+    )
+    
     # Table names
     PLAYERS_TABLE = "players"
     MATCHES_TABLE = "matches"
     SERIES_TABLE = "series"
     PERFORMANCES_TABLE = "player_performances"
+    TEAMS_TABLE = "teams"
     
     # Query limits
     DEFAULT_LIMIT = 100
@@ -2,6 +2,9 @@
 # Live Matches Page Implementation
 # Real-time cricket match updates from Cricbuzz API
 
+import re
+import string
+from functools import lru_cache
 import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
@@ -12,6 +15,41 @@ from components.sidebar import create_page_sidebar_content
 from utils.api_client import CricbuzzAPI
 from utils.database_manager import DatabaseManager
 
+# Status text that marks a match as finished ("India won by 36 runs", "Match complete")
+_DONE_RE = re.compile(r'won|complete', re.IGNORECASE).search
+
+# Match summary card HTML, compiled once at import
+_MATCH_SUMMARY_CARD_TPL = string.Template("""
+    <div style="background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%); 
+                border: 1px solid #e9ecef; border-radius: 12px; padding: 20px; 
+                margin: 15px 0; box-shadow: 0 4px 12px rgba(0,0,0,0.08);">
+        <h4 style="color: #2c3e50; margin-top: 0;">$description</h4>
+        <div style="display: flex; justify-content: space-between; align-items: center;">
+            <div>
+                <strong>$team1</strong><br>
+                <span style="font-size: 1.2em; color: #FF6B35;">$team1_score</span>
+            </div>
+            <div style="text-align: center;">
+                <div style="background: #28a745; color: white; padding: 5px 10px; 
+                           border-radius: 15px; font-size: 0.9em;">$status</div>
+            </div>
+            <div style="text-align: right;">
+                <strong>$team2</strong><br>
+                <span style="font-size: 1.2em; color: #1f77b4;">$team2_score</span>
+            </div>
+        </div>
+        <hr style="margin: 15px 0;">
+        <div style="display: flex; justify-content: space-between; font-size: 0.9em; color: #6c757d;">
+            <span><strong>Venue:</strong> $venue</span>
+            <span><strong>Format:</strong> $format</span>
+        </div>
+    </div>
+    """)
+
+# Placeholders in _MATCH_SUMMARY_CARD_TPL, in a fixed order for the render cache key
+_MATCH_SUMMARY_FIELDS = ('description', 'team1', 'team1_score', 'status',
+                         'team2', 'team2_score', 'venue', 'format')
+
 def live_matches_page():
     """
     Live Matches Page - Real-time cricket match updates
@@ -287,7 +325,8 @@ def show_match_details(api_client, match_id, match_data):
                 if isinstance(detailed_info, dict):
                     for key in detailed_info.keys():
                         st.write(f"- {key}: {type(detailed_info[key])}")
-                st.json(detailed_info)
+                if st.checkbox("Show raw API response", key=f"show_raw_match_{match_id}"):
+                    st.json(detailed_info)
                 
         else:
             st.error("❌ No match details received from API")
@@ -646,7 +685,7 @@ def display_recent_matches():
                     st.metric("Total Recent Matches", len(recent_matches_list))
                 
                 with insight_col2:
-                    completed_matches = len([m for m in recent_matches_list if 'won' in m['Status'].lower() or 'complete' in m['Status'].lower()])
+                    completed_matches = sum(1 for m in recent_matches_list if _DONE_RE(m['Status']))
                     st.metric("Completed Matches", completed_matches)
                 
                 with insight_col3:
@@ -671,7 +710,8 @@ def display_recent_matches():
             with st.expander("Debug: API Response Structure"):
                 if recent_matches_data:
                     st.write("API Response Keys:", list(recent_matches_data.keys()) if isinstance(recent_matches_data, dict) else "Not a dictionary")
-                    st.json(recent_matches_data)
+                    if st.checkbox("Show raw API response", key="show_raw_recent"):
+                        st.json(recent_matches_data)
                 else:
                     st.write("No data received from API")
                     
@@ -682,32 +722,14 @@ def display_recent_matches():
 # Additional utility functions
 def create_match_summary_card(match_info):
     """Create a detailed match summary card"""
-    return f"""
-    <div style="background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%); 
-                border: 1px solid #e9ecef; border-radius: 12px; padding: 20px; 
-                margin: 15px 0; box-shadow: 0 4px 12px rgba(0,0,0,0.08);">
-        <h4 style="color: #2c3e50; margin-top: 0;">{match_info['description']}</h4>
-        <div style="display: flex; justify-content: space-between; align-items: center;">
-            <div>
-                <strong>{match_info['team1']}</strong><br>
-                <span style="font-size: 1.2em; color: #FF6B35;">{match_info['team1_score']}</span>
-            </div>
-            <div style="text-align: center;">
-                <div style="background: #28a745; color: white; padding: 5px 10px; 
-                           border-radius: 15px; font-size: 0.9em;">{match_info['status']}</div>
-            </div>
-            <div style="text-align: right;">
-                <strong>{match_info['team2']}</strong><br>
-                <span style="font-size: 1.2em; color: #1f77b4;">{match_info['team2_score']}</span>
-            </div>
-        </div>
-        <hr style="margin: 15px 0;">
-        <div style="display: flex; justify-content: space-between; font-size: 0.9em; color: #6c757d;">
-            <span><strong>Venue:</strong> {match_info['venue']}</span>
-            <span><strong>Format:</strong> {match_info['format']}</span>
-        </div>
-    </div>
-    """
+    # Keyed on just the template's fields, as the text they render to, so extra or
+    # unhashable (nested dict/list) values in match_info can't break the cache
+    return _render_match_summary_card(tuple(str(match_info[field]) for field in _MATCH_SUMMARY_FIELDS))
+
+@lru_cache(maxsize=64)
+def _render_match_summary_card(values):
+    """Render the summary card HTML; repeat renders of the same match are cache hits"""
+    return _MATCH_SUMMARY_CARD_TPL.substitute(dict(zip(_MATCH_SUMMARY_FIELDS, values)))
 
 def get_live_match_metrics():
     """Get key metrics for live matches"""
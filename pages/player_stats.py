@@ -2,12 +2,16 @@
 # Player Statistics Page Implementation
 # Comprehensive player analytics with filtering and visualizations
 
+import string
+import types
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import numpy as np
 from components.styles import create_main_header, create_stat_card
 from components.sidebar import create_page_sidebar_content
 from utils.database_manager import DatabaseManager
@@ -15,6 +19,41 @@ from utils.api_client import CricbuzzAPIClient
 
 from config.app_config import AppConfig
 
+# Shared read-only default for nested .get() lookups on API payloads
+_EMPTY = types.MappingProxyType({})
+
+# Possible keys holding player data in rankings responses, in priority order
+_BAT_KEYS = ('rank', 'rankings', 'players', 'batsmen', 'data', 'values')
+_BOWL_KEYS = ('rank', 'rankings', 'players', 'bowlers', 'data', 'values')
+
+# (st function, message) notice for a rankings payload with none of those keys
+_UNRECOGNIZED_NOTICE = ('info', "API response structure not recognized, using sample data")
+
+# Layout shared by every rankings bar chart
+_BAR_LAYOUT = dict(xaxis_tickangle=-45, height=400, margin=dict(l=10, r=10, t=40, b=80))
+
+# Player info card bodies, compiled once at import
+_BASIC_INFO_TPL = string.Template("""
+                <h3>📋 Basic Info</h3>
+                <p><strong>Name:</strong> $name</p>
+                <p><strong>Country:</strong> $country</p>
+                <p><strong>Role:</strong> $role</p>
+                """)
+
+_CAREER_STATS_TPL = string.Template("""
+                <h3>🏏 Career Stats</h3>
+                <p><strong>Matches:</strong> $matches</p>
+                <p><strong>Runs:</strong> $runs</p>
+                <p><strong>Average:</strong> $average</p>
+                """)
+
+_BOWLING_OTHER_TPL = string.Template("""
+                <h3>🎯 Bowling/Other</h3>
+                <p><strong>Wickets:</strong> $wickets</p>
+                <p><strong>Economy:</strong> $economy</p>
+                <p><strong>Catches:</strong> $catches</p>
+                """)
+
 def player_stats_page():
     """
     Player Statistics Page - Real-time player statistics from Cricbuzz API
@@ -69,32 +108,36 @@ def display_live_rankings_tab(api_client, format_filter):
     """Display live rankings using actual API methods"""
     st.subheader(f"📊 Live Rankings - {format_filter.upper()}")
     
+    # Batting and bowling rankings are independent, so fetch them concurrently.
+    # Worker threads inherit the script context for the cached loaders; the loaders
+    # draw nothing themselves, their parse notices are rendered in the columns below.
+    with st.spinner("Fetching live rankings..."), ThreadPoolExecutor(
+        max_workers=2, initializer=add_script_run_ctx, initargs=(None, get_script_run_ctx())
+    ) as executor:
+        batting_future = executor.submit(load_batting_df, api_client, format_filter)
+        bowling_future = executor.submit(load_bowling_df, api_client, format_filter)
+        (batting_df, batting_fetched, batting_notice), (bowling_df, bowling_fetched, bowling_notice) = (
+            batting_future.result(), bowling_future.result()
+        )
+    
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("🏏 Batting Rankings")
+        _show_notice(batting_notice)
         
-        with st.spinner("Fetching live batting rankings..."):
-            batting_data = api_client.get_batting_rankings(format_filter)
-        
-        if batting_data:
-            # Parse the actual API response structure
-            batting_df = parse_batting_rankings(batting_data)
-            
+        if batting_fetched:
             if batting_df is not None and not batting_df.empty:
                 st.dataframe(batting_df, use_container_width=True, hide_index=True)
                 
                 # Create visualization
                 if len(batting_df) >= 5:
-                    fig_batting = px.bar(
-                        batting_df.head(8),
-                        x='Player',
-                        y='Points',
-                        color='Country',
-                        title=f'Top Batsmen - {format_filter.upper()}',
-                        hover_data=['Rank', 'Rating'] if 'Rating' in batting_df.columns else ['Rank']
+                    fig_batting = _rank_bar(
+                        batting_df.head(8).to_dict('records'),
+                        'Points',
+                        f'Top Batsmen - {format_filter.upper()}',
+                        hover_cols=('Rank', 'Rating')
                     )
-                    fig_batting.update_layout(xaxis_tickangle=-45, height=400)
                     st.plotly_chart(fig_batting, use_container_width=True)
             else:
                 st.info("No batting rankings data available")
@@ -105,28 +148,20 @@ def display_live_rankings_tab(api_client, format_filter):
     
     with col2:
         st.subheader("🎯 Bowling Rankings")
+        _show_notice(bowling_notice)
         
-        with st.spinner("Fetching live bowling rankings..."):
-            bowling_data = api_client.get_bowling_rankings(format_filter)
-        
-        if bowling_data:
-            # Parse the actual API response structure
-            bowling_df = parse_bowling_rankings(bowling_data)
-            
+        if bowling_fetched:
             if bowling_df is not None and not bowling_df.empty:
                 st.dataframe(bowling_df, use_container_width=True, hide_index=True)
                 
                 # Create visualization
                 if len(bowling_df) >= 5:
-                    fig_bowling = px.bar(
-                        bowling_df.head(8),
-                        x='Player',
-                        y='Points',
-                        color='Country',
-                        title=f'Top Bowlers - {format_filter.upper()}',
-                        hover_data=['Rank', 'Rating'] if 'Rating' in bowling_df.columns else ['Rank']
+                    fig_bowling = _rank_bar(
+                        bowling_df.head(8).to_dict('records'),
+                        'Points',
+                        f'Top Bowlers - {format_filter.upper()}',
+                        hover_cols=('Rank', 'Rating')
                     )
-                    fig_bowling.update_layout(xaxis_tickangle=-45, height=400)
                     st.plotly_chart(fig_bowling, use_container_width=True)
             else:
                 st.info("No bowling rankings data available")
@@ -135,28 +170,59 @@ def display_live_rankings_tab(api_client, format_filter):
             st.warning("Unable to fetch bowling rankings from API")
             display_sample_bowling_rankings(format_filter)
     
-    # Show raw API response for debugging
+    # Show raw API response for debugging - fetched (from the client's own cache)
+    # and serialized only when toggled on, never stored alongside the parsed frames
     with st.expander("🔧 Raw API Response (Debug)", expanded=False):
-        col1, col2 = st.columns(2)
-        with col1:
-            st.subheader("Batting API Response")
-            if batting_data:
-                st.json(batting_data)
-            else:
-                st.write("No batting data received")
-        
-        with col2:
-            st.subheader("Bowling API Response")
-            if bowling_data:
-                st.json(bowling_data)
-            else:
-                st.write("No bowling data received")
+        if st.checkbox("Show raw API response", key="show_raw_rank"):
+            batting_data = api_client.get_batting_rankings(format_filter)
+            bowling_data = api_client.get_bowling_rankings(format_filter)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader("Batting API Response")
+                if batting_data:
+                    st.json(batting_data)
+                else:
+                    st.write("No batting data received")
+            
+            with col2:
+                st.subheader("Bowling API Response")
+                if bowling_data:
+                    st.json(bowling_data)
+                else:
+                    st.write("No bowling data received")
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_batting_df(_api_client, format_filter):
+    """Fetch and parse batting rankings; returns (DataFrame or None, fetched, notice)"""
+    raw = _api_client.get_batting_rankings(format_filter)
+    if not raw:
+        return None, False, None
+    df, notice = parse_batting_rankings(raw)
+    return df, True, notice
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_bowling_df(_api_client, format_filter):
+    """Fetch and parse bowling rankings; returns (DataFrame or None, fetched, notice)"""
+    raw = _api_client.get_bowling_rankings(format_filter)
+    if not raw:
+        return None, False, None
+    df, notice = parse_bowling_rankings(raw)
+    return df, True, notice
+
+def _show_notice(notice):
+    """
+    Render a loader's (st function name, message) notice, if any
+    The loaders run cached on worker threads, so they hand messages back instead of drawing them
+    """
+    if notice:
+        level, message = notice
+        getattr(st, level)(message)
 
 def parse_batting_rankings(api_response):
-    """Parse batting rankings from API response"""
+    """Parse batting rankings from API response; returns (DataFrame or None, notice or None)"""
     try:
         if not api_response:
-            return None
+            return None, None
         
         players_data = []
         
@@ -164,75 +230,75 @@ def parse_batting_rankings(api_response):
         # For now, let's handle common possible structures
         
         if isinstance(api_response, dict):
-            # Look for different possible keys where player data might be
-            possible_keys = ['rank', 'rankings', 'players', 'batsmen', 'data', 'values']
-            
-            for key in possible_keys:
-                if key in api_response:
-                    data = api_response[key]
-                    
-                    if isinstance(data, list):
-                        for i, player in enumerate(data[:15]):  # Top 15
-                            if isinstance(player, dict):
-                                player_info = {
-                                    'Rank': i + 1,
-                                    'Player': player.get('name', player.get('player', f'Player {i+1}')),
-                                    'Country': player.get('country', player.get('team', 'Unknown')),
-                                    'Points': player.get('points', player.get('rating', np.random.randint(700, 900))),
-                                    'Rating': player.get('rating', player.get('points', np.random.randint(700, 900)))
-                                }
-                                players_data.append(player_info)
-                        break
+            # First key (in priority order) that holds a list of players
+            key = next((k for k in _BAT_KEYS if isinstance(api_response.get(k), list)), None)
+            if key is not None:
+                players_data = _rankings_rows(api_response[key][:15])  # Top 15
             
             # If no structured data found, create sample data based on API response
             if not players_data:
-                st.info("API response structure not recognized, using sample data")
-                return None
+                return None, _UNRECOGNIZED_NOTICE
         
-        return pd.DataFrame(players_data) if players_data else None
+        return (_build_rankings_df(players_data) if players_data else None), None
         
     except Exception as e:
-        st.error(f"Error parsing batting rankings: {e}")
-        return None
+        return None, ('error', f"Error parsing batting rankings: {e}")
 
 def parse_bowling_rankings(api_response):
-    """Parse bowling rankings from API response"""
+    """Parse bowling rankings from API response; returns (DataFrame or None, notice or None)"""
     try:
         if not api_response:
-            return None
+            return None, None
         
         players_data = []
         
         if isinstance(api_response, dict):
-            # Look for different possible keys where player data might be
-            possible_keys = ['rank', 'rankings', 'players', 'bowlers', 'data', 'values']
-            
-            for key in possible_keys:
-                if key in api_response:
-                    data = api_response[key]
-                    
-                    if isinstance(data, list):
-                        for i, player in enumerate(data[:15]):  # Top 15
-                            if isinstance(player, dict):
-                                player_info = {
-                                    'Rank': i + 1,
-                                    'Player': player.get('name', player.get('player', f'Player {i+1}')),
-                                    'Country': player.get('country', player.get('team', 'Unknown')),
-                                    'Points': player.get('points', player.get('rating', np.random.randint(650, 800))),
-                                    'Rating': player.get('rating', player.get('points', np.random.randint(650, 800)))
-                                }
-                                players_data.append(player_info)
-                        break
+            # First key (in priority order) that holds a list of players
+            key = next((k for k in _BOWL_KEYS if isinstance(api_response.get(k), list)), None)
+            if key is not None:
+                players_data = _rankings_rows(api_response[key][:15])  # Top 15
             
             if not players_data:
-                st.info("API response structure not recognized, using sample data")
-                return None
+                return None, _UNRECOGNIZED_NOTICE
         
-        return pd.DataFrame(players_data) if players_data else None
+        return (_build_rankings_df(players_data) if players_data else None), None
         
     except Exception as e:
-        st.error(f"Error parsing bowling rankings: {e}")
-        return None
+        return None, ('error', f"Error parsing bowling rankings: {e}")
+
+def _field(player, key, fallback_key, default=None):
+    """A ranking row's value under key, else under fallback_key, else default"""
+    if key in player:
+        return player[key]
+    return player.get(fallback_key, default)
+
+def _rankings_rows(players):
+    """Convert raw ranking entries into display rows, falling back per row for mixed payloads"""
+    rows = []
+    for i, player in enumerate(players):
+        if isinstance(player, dict):
+            rows.append({
+                'Rank': i + 1,
+                'Player': _field(player, 'name', 'player', f'Player {i+1}'),
+                'Country': _field(player, 'country', 'team', 'Unknown'),
+                'Points': _field(player, 'points', 'rating'),
+                'Rating': _field(player, 'rating', 'points')
+            })
+    return rows
+
+def _build_rankings_df(players_data):
+    """
+    Build a rankings DataFrame with compact dtypes.
+    Missing Points/Rating are filled in one vectorized pass; the pyarrow-backed
+    Player column hands off to st.dataframe without an object->arrow conversion.
+    """
+    df = pd.DataFrame(players_data)
+    score_cols = ['Points', 'Rating']
+    df['Rank'] = df['Rank'].astype('int16')
+    df[score_cols] = df[score_cols].apply(pd.to_numeric, errors='coerce').fillna(0).astype('int16')
+    df['Country'] = df['Country'].astype('category')
+    df['Player'] = df['Player'].astype('string[pyarrow]')
+    return df
 
 def display_player_search_tab(api_client):
     """Display player search functionality"""
@@ -270,13 +336,9 @@ def display_player_search_tab(api_client):
                     st.dataframe(players_df, use_container_width=True)
                     
                     # Team distribution chart
-                    if 'Team' in players_df.columns:
-                        team_counts = players_df['Team'].value_counts()
-                        fig = px.pie(
-                            values=team_counts.values,
-                            names=team_counts.index,
-                            title="Current Teams in Matches"
-                        )
+                    team_counts = extract_team_counts(matches)
+                    if team_counts:
+                        fig = _team_pie(tuple(team_counts.most_common()))
                         st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.info("No current players found in live matches")
@@ -297,32 +359,30 @@ def display_player_info_card(player_info):
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                st.markdown(create_stat_card(f"""
-                <h3>📋 Basic Info</h3>
-                <p><strong>Name:</strong> {player_info.get('name', 'Unknown')}</p>
-                <p><strong>Country:</strong> {player_info.get('country', player_info.get('team', 'Unknown'))}</p>
-                <p><strong>Role:</strong> {player_info.get('role', player_info.get('playingRole', 'Unknown'))}</p>
-                """), unsafe_allow_html=True)
+                st.markdown(create_stat_card(_BASIC_INFO_TPL.substitute(
+                    name=player_info.get('name', 'Unknown'),
+                    country=player_info.get('country', player_info.get('team', 'Unknown')),
+                    role=player_info.get('role', player_info.get('playingRole', 'Unknown'))
+                )), unsafe_allow_html=True)
             
             with col2:
-                st.markdown(create_stat_card(f"""
-                <h3>🏏 Career Stats</h3>
-                <p><strong>Matches:</strong> {player_info.get('matches', 'N/A')}</p>
-                <p><strong>Runs:</strong> {player_info.get('runs', player_info.get('totalRuns', 'N/A'))}</p>
-                <p><strong>Average:</strong> {player_info.get('average', player_info.get('battingAverage', 'N/A'))}</p>
-                """), unsafe_allow_html=True)
+                st.markdown(create_stat_card(_CAREER_STATS_TPL.substitute(
+                    matches=player_info.get('matches', 'N/A'),
+                    runs=player_info.get('runs', player_info.get('totalRuns', 'N/A')),
+                    average=player_info.get('average', player_info.get('battingAverage', 'N/A'))
+                )), unsafe_allow_html=True)
             
             with col3:
-                st.markdown(create_stat_card(f"""
-                <h3>🎯 Bowling/Other</h3>
-                <p><strong>Wickets:</strong> {player_info.get('wickets', 'N/A')}</p>
-                <p><strong>Economy:</strong> {player_info.get('economy', 'N/A')}</p>
-                <p><strong>Catches:</strong> {player_info.get('catches', 'N/A')}</p>
-                """), unsafe_allow_html=True)
+                st.markdown(create_stat_card(_BOWLING_OTHER_TPL.substitute(
+                    wickets=player_info.get('wickets', 'N/A'),
+                    economy=player_info.get('economy', 'N/A'),
+                    catches=player_info.get('catches', 'N/A')
+                )), unsafe_allow_html=True)
         
         # Show raw player data for debugging
         with st.expander("🔧 Raw Player Data", expanded=False):
-            st.json(player_info)
+            if st.checkbox("Show raw player data", key="show_raw_player"):
+                st.json(player_info)
             
     except Exception as e:
         st.error(f"Error displaying player info: {e}")
@@ -350,19 +410,28 @@ def display_team_analysis_tab(api_client):
                     st.subheader("🌍 Match Venues")
                     venues = [team['Venue'] for team in teams_analysis if team['Venue'] != 'Unknown']
                     if venues:
-                        venue_counts = pd.Series(venues).value_counts()
-                        fig = px.bar(
-                            x=venue_counts.index,
-                            y=venue_counts.values,
-                            title="Matches by Venue"
-                        )
-                        fig.update_layout(xaxis_tickangle=-45)
+                        venue_counts = Counter(venues)
+                        fig = _venue_bar(tuple(venue_counts.most_common()))
                         st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("No team data available from current matches")
         else:
             st.info("No live matches data available")
 
+@st.cache_data(show_spinner=False)
+def _team_pie(counts_tuple):
+    """Team distribution pie, cached by (team, count) pairs"""
+    idx, vals = zip(*counts_tuple)
+    return px.pie(values=list(vals), names=list(idx), title="Current Teams in Matches")
+
+@st.cache_data(show_spinner=False)
+def _venue_bar(counts_tuple):
+    """Matches-by-venue bar chart, cached by (venue, count) pairs"""
+    idx, vals = zip(*counts_tuple)
+    fig = px.bar(x=list(idx), y=list(vals), title="Matches by Venue")
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
 def extract_players_from_matches(matches_data):
     """Extract player/team information from live matches"""
     players_info = []
@@ -372,13 +441,13 @@ def extract_players_from_matches(matches_data):
             for match_type in matches_data['typeMatches']:
                 if 'seriesMatches' in match_type:
                     for series in match_type['seriesMatches']:
-                        if 'matches' in series.get('seriesAdWrapper', {}):
+                        if 'matches' in series.get('seriesAdWrapper', _EMPTY):
                             for match in series['seriesAdWrapper']['matches']:
-                                match_info = match.get('matchInfo', {})
+                                match_info = match.get('matchInfo', _EMPTY)
                                 
                                 # Extract team information
-                                team1 = match_info.get('team1', {})
-                                team2 = match_info.get('team2', {})
+                                team1 = match_info.get('team1', _EMPTY)
+                                team2 = match_info.get('team2', _EMPTY)
                                 
                                 if team1.get('teamName'):
                                     players_info.append({
@@ -386,7 +455,7 @@ def extract_players_from_matches(matches_data):
                                         'Team_ID': team1.get('teamId'),
                                         'Match': match_info.get('matchDescription', 'Unknown'),
                                         'Format': match_info.get('matchFormat', 'Unknown'),
-                                        'Venue': f"{match_info.get('venueInfo', {}).get('city', 'Unknown')}"
+                                        'Venue': f"{match_info.get('venueInfo', _EMPTY).get('city', 'Unknown')}"
                                     })
                                 
                                 if team2.get('teamName'):
@@ -395,47 +464,67 @@ def extract_players_from_matches(matches_data):
                                         'Team_ID': team2.get('teamId'),
                                         'Match': match_info.get('matchDescription', 'Unknown'),
                                         'Format': match_info.get('matchFormat', 'Unknown'),
-                                        'Venue': f"{match_info.get('venueInfo', {}).get('city', 'Unknown')}"
+                                        'Venue': f"{match_info.get('venueInfo', _EMPTY).get('city', 'Unknown')}"
                                     })
     except Exception as e:
         st.error(f"Error extracting players: {e}")
     
     return players_info
 
+def extract_team_counts(matches_data):
+    """Count team appearances across live matches in a single pass"""
+    team_counts = Counter()
+    
+    try:
+        if isinstance(matches_data, dict) and 'typeMatches' in matches_data:
+            for match_type in matches_data['typeMatches']:
+                for series in match_type.get('seriesMatches', ()):
+                    for match in series.get('seriesAdWrapper', _EMPTY).get('matches', ()):
+                        match_info = match.get('matchInfo', _EMPTY)
+                        
+                        for team_key in ('team1', 'team2'):
+                            team_name = match_info.get(team_key, _EMPTY).get('teamName')
+                            if team_name:
+                                team_counts[team_name] += 1
+    except Exception as e:
+        st.error(f"Error counting teams: {e}")
+    
+    return team_counts
+
 def analyze_teams_from_matches(matches_data):
     """Analyze teams from matches data"""
     return extract_players_from_matches(matches_data)
 
+@st.cache_data(show_spinner=False)
+def _rank_bar(head_records, y_col, title, hover_cols=None):
+    """Top-N rankings bar chart with the shared layout, cached by its inputs"""
+    fig = px.bar(
+        pd.DataFrame(head_records),
+        x='Player',
+        y=y_col,
+        color='Country',
+        title=title,
+        hover_data=list(hover_cols) if hover_cols else None
+    )
+    fig.update_layout(**_BAR_LAYOUT)
+    return fig
+
 def display_sample_batting_rankings(format_filter):
     """Display sample batting rankings when API data is unavailable"""
     sample_data = get_sample_batting_data(format_filter)
-    df = pd.DataFrame(sample_data)
+    df = _build_rankings_df(sample_data)
     st.dataframe(df, use_container_width=True, hide_index=True)
     
-    fig = px.bar(
-        df.head(8),
-        x='Player',
-        y='Rating',
-        color='Country',
-        title=f'Sample Top Batsmen - {format_filter.upper()}'
-    )
-    fig.update_layout(xaxis_tickangle=-45)
+    fig = _rank_bar(df.head(8).to_dict('records'), 'Rating', f'Sample Top Batsmen - {format_filter.upper()}')
     st.plotly_chart(fig, use_container_width=True)
 
 def display_sample_bowling_rankings(format_filter):
     """Display sample bowling rankings when API data is unavailable"""
     sample_data = get_sample_bowling_data(format_filter)
-    df = pd.DataFrame(sample_data)
+    df = _build_rankings_df(sample_data)
     st.dataframe(df, use_container_width=True, hide_index=True)
     
-    fig = px.bar(
-        df.head(8),
-        x='Player',
-        y='Rating',
-        color='Country',
-        title=f'Sample Top Bowlers - {format_filter.upper()}'
-    )
-    fig.update_layout(xaxis_tickangle=-45)
+    fig = _rank_bar(df.head(8).to_dict('records'), 'Rating', f'Sample Top Bowlers - {format_filter.upper()}')
     st.plotly_chart(fig, use_container_width=True)
 
 def get_sample_batting_data(format_filter):
@@ -2,6 +2,10 @@
 # SQL Analytics Page Implementation
 # Interactive execution of all 25 SQL practice queries
 
+import re
+import textwrap
+from collections import Counter
+from io import BytesIO
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -11,7 +15,312 @@ from components.styles import create_main_header, create_stat_card
 from components.sidebar import create_page_sidebar_content
 from utils.database_manager import DatabaseManager
 from utils.sql_queries import SQLQueries
-from config.app_config import AppConfig
+from config.app_config import AppConfig, DatabaseConfig
+
+# Chart widgets rerun only their own fragment where supported (st.fragment in
+# Streamlit >= 1.37, st.experimental_fragment from 1.33); older versions,
+# including the pinned 1.28, fall back to full-page reruns
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+# orjson encodes the JSON export much faster than pandas' to_json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Prefer xlsxwriter for Excel export - it writes the workbook faster and with
+# less memory than openpyxl
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+# Static page content - rendered once at import rather than rebuilt on every rerun
+_CATEGORY_CARDS = (
+    create_stat_card("""
+        <h3>🟢 Beginner (Questions 1-8)</h3>
+        <h4>Core SQL Fundamentals</h4>
+        <ul>
+        <li>Basic SELECT statements</li>
+        <li>WHERE clause filtering</li>
+        <li>ORDER BY and GROUP BY</li>
+        <li>Simple aggregate functions</li>
+        <li>Date/time operations</li>
+        <li>String manipulations</li>
+        <li>DISTINCT operations</li>
+        <li>Basic table joins</li>
+        </ul>
+        <p><em>Perfect for SQL beginners and foundational concepts</em></p>
+        """),
+    create_stat_card("""
+        <h3>🟡 Intermediate (Questions 9-16)</h3>
+        <h4>Advanced Query Techniques</h4>
+        <ul>
+        <li>Complex JOINs (INNER, LEFT, RIGHT)</li>
+        <li>Subqueries and correlated queries</li>
+        <li>CASE statements</li>
+        <li>Advanced GROUP BY with HAVING</li>
+        <li>Multiple table analysis</li>
+        <li>Conditional aggregations</li>
+        <li>Data transformation</li>
+        <li>Performance analysis queries</li>
+        </ul>
+        <p><em>Builds on fundamentals with real-world complexity</em></p>
+        """),
+    create_stat_card("""
+        <h3>🔴 Advanced (Questions 17-25)</h3>
+        <h4>Expert-Level Analytics</h4>
+        <ul>
+        <li>Window functions (ROW_NUMBER, RANK)</li>
+        <li>Common Table Expressions (CTEs)</li>
+        <li>Statistical calculations</li>
+        <li>Time-series analysis</li>
+        <li>LAG/LEAD functions</li>
+        <li>Complex business logic</li>
+        <li>Performance ranking systems</li>
+        <li>Predictive analytics queries</li>
+        </ul>
+        <p><em>Professional-level SQL for data analysis</em></p>
+        """),
+)
+
+# Learning guide tab bodies, in tab order
+_LEARNING_TABS = (
+    """
+        ### 🌱 Getting Started with SQL
+        
+        **Step 1: Understand the Database Schema**
+        ```sql
+        -- Explore tables and their structure
+        SELECT name FROM sqlite_master WHERE type='table';
+        
+        -- Check table columns
+        PRAGMA table_info(players);
+        ```
+        
+        **Step 2: Basic SELECT Queries**
+        ```sql
+        -- Simple data retrieval
+        SELECT name, country FROM players LIMIT 5;
+        
+        -- Filtering data
+        SELECT * FROM players WHERE country = 'India';
+        ```
+        
+        **Step 3: Sorting and Grouping**
+        ```sql
+        -- Sort results
+        SELECT name, total_runs FROM players ORDER BY total_runs DESC;
+        
+        -- Group and aggregate
+        SELECT country, COUNT(*) FROM players GROUP BY country;
+        ```
+        
+        **🎯 Practice Queries:** Start with Questions 1-4 for basic concepts.
+        """,
+    """
+        ### 📈 Building Advanced Skills
+        
+        **JOINs - Connecting Related Data**
+        ```sql
+        -- INNER JOIN example
+        SELECT p.name, m.match_description 
+        FROM players p 
+        INNER JOIN player_performances pp ON p.id = pp.player_id
+        INNER JOIN matches m ON pp.match_id = m.id;
+        ```
+        
+        **Subqueries - Queries within Queries**
+        ```sql
+        -- Find players with above-average runs
+        SELECT name, total_runs 
+        FROM players 
+        WHERE total_runs > (SELECT AVG(total_runs) FROM players);
+        ```
+        
+        **CASE Statements - Conditional Logic**
+        ```sql
+        -- Categorize players by performance
+        SELECT name,
+            CASE 
+                WHEN batting_average >= 50 THEN 'Excellent'
+                WHEN batting_average >= 35 THEN 'Good'
+                ELSE 'Average'
+            END as performance_category
+        FROM players;
+        ```
+        
+        **🎯 Practice Queries:** Work through Questions 9-12 for JOIN mastery.
+        """,
+    """
+        ### 🚀 Advanced Mastery
+        
+        **Window Functions - Advanced Analytics**
+        ```sql
+        -- Rank players by runs with ties
+        SELECT name, total_runs,
+            RANK() OVER (ORDER BY total_runs DESC) as rank
+        FROM players;
+        
+        -- Running totals and moving averages
+        SELECT name, total_runs,
+            SUM(total_runs) OVER (ORDER BY total_runs) as running_total
+        FROM players;
+        ```
+        
+        **Common Table Expressions (CTEs)**
+        ```sql
+        -- Complex multi-step analysis
+        WITH top_batsmen AS (
+            SELECT name, total_runs, batting_average
+            FROM players 
+            WHERE total_runs > 5000
+        )
+        SELECT * FROM top_batsmen 
+        WHERE batting_average > 40;
+        ```
+        
+        **Statistical Analysis**
+        ```sql
+        -- Calculate standard deviation for consistency
+        SELECT name,
+            SQRT(AVG(runs_scored * runs_scored) - AVG(runs_scored) * AVG(runs_scored)) as consistency
+        FROM player_performances pp
+        JOIN players p ON pp.player_id = p.id
+        GROUP BY name;
+        ```
+        
+        **🎯 Practice Queries:** Master Questions 17-25 for expert-level skills.
+        """,
+    """
+        ### 💼 SQL Best Practices
+        
+        **Performance Optimization**
+        - Use indexes on frequently queried columns
+        - Limit results with LIMIT clause when appropriate
+        - Use EXISTS instead of IN for better performance
+        - Avoid SELECT * in production queries
+        
+        **Code Quality**
+        ```sql
+        -- Good: Clear, readable formatting
+        SELECT 
+            p.name,
+            p.country,
+            COUNT(pp.id) as matches_played,
+            AVG(pp.runs_scored) as avg_runs
+        FROM players p
+        LEFT JOIN player_performances pp ON p.id = pp.player_id
+        WHERE p.country IN ('India', 'Australia')
+        GROUP BY p.name, p.country
+        HAVING COUNT(pp.id) >= 5
+        ORDER BY avg_runs DESC;
+        ```
+        
+        **Error Handling**
+        - Always check for NULL values with appropriate handling
+        - Use COALESCE or CASE for NULL replacements
+        - Validate data types in calculations
+        - Include meaningful aliases for readability
+        
+        **Documentation**
+        - Comment complex queries
+        - Use meaningful table and column aliases
+        - Document business logic in query comments
+        - Maintain consistent formatting style
+        """,
+)
+
+# Default view introduction
+_DEFAULT_INTRO = """
+    Welcome to the SQL Analytics section! This implements all **25 practice questions** from the assignment.
+    
+    ### 🎯 Learning Objectives
+    - Master different SQL concepts from basic to advanced
+    - Practice with real cricket data scenarios
+    - Understand database analytics in sports domain
+    - Learn query optimization and complex joins
+    
+    ### 📊 How to Use This Section
+    1. **Select Difficulty Level** from the sidebar (Beginner, Intermediate, or Advanced)
+    2. **Choose a Query** from the dropdown list
+    3. **Click 'Execute Query'** to run the SQL statement
+    4. **View Results** in the data table below
+    5. **Explore Visualizations** for better insights
+    6. **Check SQL Code** to understand the implementation
+    7. **Download Results** in CSV, JSON, or Excel format
+    """
+
+# Database schema quick reference - (tab, heading, table) per tab, rendered from
+# the CREATE TABLE statements SQLite stores so it always matches the live schema
+_SCHEMA_TABS = (
+    ("Players", "Players Table Structure", DatabaseConfig.PLAYERS_TABLE),
+    ("Matches", "Matches Table Structure", DatabaseConfig.MATCHES_TABLE),
+    ("Performances", "Player Performances Table", DatabaseConfig.PERFORMANCES_TABLE),
+    ("Series", "Series Table Structure", DatabaseConfig.SERIES_TABLE),
+    ("Teams", "Teams Lookup Table", DatabaseConfig.TEAMS_TABLE),
+)
+
+# Featured query highlight cards on the default view
+_FEATURED_CARDS = (
+    create_stat_card("""
+        <h4>🟢 Beginner Highlight</h4>
+        <h5>Q3: Top 10 Run Scorers</h5>
+        <p>Perfect introduction to ORDER BY and LIMIT clauses. Learn basic ranking and data limitation techniques.</p>
+        <code>ORDER BY total_runs DESC LIMIT 10</code>
+        """),
+    create_stat_card("""
+        <h4>🟡 Intermediate Highlight</h4>
+        <h5>Q11: Multi-Format Performance</h5>
+        <p>Master CASE statements with JOINs for cross-format analysis. Essential for sports analytics.</p>
+        <code>CASE WHEN match_format = 'Test'...</code>
+        """),
+    create_stat_card("""
+        <h4>🔴 Advanced Highlight</h4>
+        <h5>Q25: Career Trajectory Analysis</h5>
+        <p>Expert-level time-series analysis with LAG functions and trend calculations. Professional analytics.</p>
+        <code>LAG(avg_runs) OVER (ORDER BY...)</code>
+        """),
+)
+
+@st.cache_resource
+def get_db_manager():
+    """Shared DatabaseManager, created once per process instead of on every rerun"""
+    return DatabaseManager(pragmas=DatabaseConfig.ANALYTICS_PRAGMAS)
+
+@st.cache_resource
+def get_sql_queries():
+    """Shared SQLQueries bound to the cached DatabaseManager"""
+    return SQLQueries(get_db_manager())
+
+@st.cache_resource
+def _queries_by_level():
+    """Query dicts for every sidebar difficulty option, built once per process"""
+    sql_queries = get_sql_queries()
+    return {
+        "Beginner (1-8)": sql_queries.get_queries_by_difficulty("Beginner"),
+        "Intermediate (9-16)": sql_queries.get_queries_by_difficulty("Intermediate"),
+        "Advanced (17-25)": sql_queries.get_queries_by_difficulty("Advanced"),
+        "All Queries": sql_queries.get_all_queries()
+    }
+
+@st.cache_resource
+def _schema_docs():
+    """Markdown block per _SCHEMA_TABS entry, built once per process from the database DDL"""
+    ddl = get_db_manager().get_table_ddl()
+    docs = []
+    for _tab, heading, table in _SCHEMA_TABS:
+        # SQLite keeps the statement as written - drop init_database's indentation
+        first_line, _, body = ddl.get(table, f"-- {table} table not found").partition("\n")
+        sql = first_line + ("\n" + textwrap.dedent(body) if body else "")
+        docs.append(f"**{heading}:**\n```sql\n{sql};\n```")
+    return tuple(docs)
+
+def get_query_insights():
+    """Static per-query learning insights (a read-only module constant, nothing to cache)"""
+    return SQLQueries.get_query_insights()
 
 def sql_analytics_page():
     """
@@ -21,6 +330,11 @@ def sql_analytics_page():
     create_main_header()
     st.header("🔍 SQL Analytics & Practice Queries")
     
+    # Initialize panel toggles once so reruns use plain dict lookups
+    st.session_state.setdefault('show_categories', False)
+    st.session_state.setdefault('show_learning_guide', False)
+    st.session_state.setdefault('active_query', None)
+    
     # Add page-specific sidebar content
     create_page_sidebar_content("🔍 SQL Analytics")
     
@@ -29,9 +343,8 @@ def sql_analytics_page():
     Each query demonstrates different SQL concepts and provides real-world cricket analytics insights.
     """)
     
-    # Initialize SQL queries class
-    db_manager = DatabaseManager()
-    sql_queries = SQLQueries(db_manager)
+    # Reuse the process-wide SQL queries instance across reruns
+    sql_queries = get_sql_queries()
     
     # Sidebar for query selection
     st.sidebar.header("📝 Query Selection")
@@ -42,14 +355,7 @@ def sql_analytics_page():
     )
     
     # Get queries based on difficulty
-    if difficulty_level == "Beginner (1-8)":
-        available_queries = sql_queries.get_queries_by_difficulty("Beginner")
-    elif difficulty_level == "Intermediate (9-16)":
-        available_queries = sql_queries.get_queries_by_difficulty("Intermediate")
-    elif difficulty_level == "Advanced (17-25)":
-        available_queries = sql_queries.get_queries_by_difficulty("Advanced")
-    else:  # All Queries
-        available_queries = sql_queries.get_all_queries()
+    available_queries = _queries_by_level()[difficulty_level]
     
     selected_query = st.sidebar.selectbox(
         "Choose Query",
@@ -66,31 +372,51 @@ def sql_analytics_page():
     if st.sidebar.button("💡 Learning Guide"):
         st.session_state['show_learning_guide'] = True
     
-    # Main content area
+    # Main content area - the executed query stays on screen across widget
+    # reruns (e.g. the visualization toggle) until another query is chosen
     if execute_button:
+        st.session_state['active_query'] = selected_query
+    query_active = st.session_state['active_query'] == selected_query
+    
+    if query_active:
         execute_selected_query(sql_queries, available_queries, selected_query)
     
     # Show categories if requested
-    if hasattr(st.session_state, 'show_categories') and st.session_state.show_categories:
+    if st.session_state['show_categories']:
         show_query_categories()
-        st.session_state.show_categories = False
+        st.session_state['show_categories'] = False
     
     # Show learning guide if requested  
-    if hasattr(st.session_state, 'show_learning_guide') and st.session_state.show_learning_guide:
+    if st.session_state['show_learning_guide']:
         show_learning_guide()
-        st.session_state.show_learning_guide = False
+        st.session_state['show_learning_guide'] = False
     
     # Default content when no query is executed
-    if not execute_button:
+    if not query_active:
         show_default_content()
 
 def execute_selected_query(sql_queries, available_queries, selected_query):
     """Execute the selected SQL query and display results"""
-    query_func = available_queries[selected_query]
-    
     with st.spinner(f"Executing {selected_query}..."):
         try:
-            df_result, query_title, sql_code = query_func()
+            # Results are capped in SQL unless the user asks for every row
+            show_all = st.checkbox("Show all rows", value=False, key="show_all_rows",
+                                   help=f"Results are limited to {DatabaseConfig.DEFAULT_LIMIT} rows by default")
+            
+            # Column picker - a subset is projected in SQL, so hidden columns are
+            # never computed or shipped (Q21 rates in NumPy and has no picker)
+            lazy_result = _lazy_result(selected_query)
+            visible_cols = None
+            if lazy_result is not None:
+                visible_cols = st.multiselect("Columns", lazy_result.columns, default=lazy_result.columns,
+                                              key=f"columns_{selected_query}")
+            
+            if visible_cols and len(visible_cols) < len(lazy_result.columns):
+                limit = None if show_all else DatabaseConfig.DEFAULT_LIMIT
+                df_result = lazy_result.head(limit, visible_cols)
+                query_title, sql_code = lazy_result.title, lazy_result.sql
+            else:
+                df_result, query_title, sql_code = _run_query(selected_query, show_all)
             
             # Display query information
             st.subheader(f"📊 {query_title}")
@@ -107,15 +433,19 @@ def execute_selected_query(sql_queries, available_queries, selected_query):
                 st.markdown("### 📋 Query Results")
                 st.dataframe(df_result, use_container_width=True)
                 
-                # Add visualization if appropriate
+                # Numeric columns drive both the chart pickers and the insights
+                numeric_cols = _numeric_cols(df_result)
+                
+                # Add visualization if appropriate - built only on demand
                 if len(df_result.columns) >= 2 and len(df_result) > 1:
-                    create_query_visualization(df_result, query_title)
+                    if st.checkbox("📈 Show visualization", value=False):
+                        create_query_visualization(df_result, query_title, numeric_cols)
                 
                 # Export functionality
                 create_export_options(df_result, query_title)
                 
                 # Query insights
-                show_query_insights(selected_query, df_result)
+                show_query_insights(selected_query, df_result, numeric_cols)
                 
             else:
                 st.warning("⚠️ No results found for this query.")
@@ -134,7 +464,41 @@ def execute_selected_query(sql_queries, available_queries, selected_query):
                 st.write("**Error Details:**")
                 st.exception(e)
 
-def create_query_visualization(df_result, query_title):
+def _run_query(selected_query, show_all=False):
+    """
+    Run a named query and return its (df, title, sql) result.
+    SQLQueries memoizes the results itself - a second cache_data layer here
+    would re-copy the shared reference frames on every hit.
+    """
+    limit = None if show_all else DatabaseConfig.DEFAULT_LIMIT
+    # SQLQueries already returns Arrow-backed columns for st.dataframe
+    return get_sql_queries().get_all_queries()[selected_query](limit=limit)
+
+@st.cache_resource
+def _lazy_result(selected_query):
+    """LazyResult for a query name, or None for queries computed outside SQL"""
+    try:
+        return get_sql_queries().lazy(selected_query)
+    except KeyError:
+        return None
+
+@st.cache_data(show_spinner=False)
+def _numeric_cols(df):
+    """Names of the numeric columns in a query result (numpy or pyarrow backed)"""
+    return [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+
+@st.cache_data(show_spinner=False)
+def _describe(df, cols):
+    """Summary statistics for the given columns"""
+    return df[cols].describe()
+
+@st.cache_data(show_spinner=False)
+def _corr(df, cols):
+    """Correlation matrix for the given columns"""
+    return df[cols].corr()
+
+@_fragment
+def create_query_visualization(df_result, query_title, numeric_cols):
     """Create appropriate visualization based on query results"""
     st.markdown("### 📈 Data Visualization")
     
@@ -148,9 +512,6 @@ def create_query_visualization(df_result, query_title):
         )
     
     with col2:
-        # Get numeric columns for visualization
-        numeric_cols = df_result.select_dtypes(include=[np.number]).columns.tolist()
-        
         if len(numeric_cols) >= 1:
             y_axis = st.selectbox("Y-Axis (Numeric)", numeric_cols)
             x_axis = st.selectbox("X-Axis", df_result.columns.tolist())
@@ -160,9 +521,14 @@ def create_query_visualization(df_result, query_title):
     
     # Create visualization based on selection
     try:
+        # Row slices shared by the chart branches
+        df15 = df_result.head(15)
+        df10 = df_result.head(10)
+        df8 = df_result.head(8)
+        
         if chart_type == "Bar Chart":
             fig = px.bar(
-                df_result.head(15), 
+                df15, 
                 x=x_axis, 
                 y=y_axis,
                 title=f"{query_title} - Bar Chart",
@@ -173,7 +539,7 @@ def create_query_visualization(df_result, query_title):
             
         elif chart_type == "Line Chart":
             fig = px.line(
-                df_result.head(15), 
+                df15, 
                 x=x_axis, 
                 y=y_axis,
                 title=f"{query_title} - Line Chart",
@@ -182,7 +548,7 @@ def create_query_visualization(df_result, query_title):
             
         elif chart_type == "Pie Chart" and len(df_result) <= 12:
             fig = px.pie(
-                df_result.head(8), 
+                df8, 
                 values=y_axis, 
                 names=x_axis,
                 title=f"{query_title} - Pie Chart"
@@ -191,17 +557,18 @@ def create_query_visualization(df_result, query_title):
         elif chart_type == "Scatter Plot" and len(numeric_cols) >= 2:
             color_col = numeric_cols[1] if len(numeric_cols) > 2 else None
             fig = px.scatter(
-                df_result, 
+                _downsample_minmax(df_result, numeric_cols[0], numeric_cols[1]), 
                 x=numeric_cols[0], 
                 y=numeric_cols[1],
                 color=color_col,
                 title=f"{query_title} - Scatter Plot",
-                hover_data=df_result.columns[:3].tolist()
+                hover_data=df_result.columns[:3].tolist(),
+                render_mode='webgl'
             )
             
         elif chart_type == "Heatmap" and len(numeric_cols) >= 2:
             # Create correlation heatmap for numeric columns
-            corr_data = df_result[numeric_cols].corr()
+            corr_data = _corr(df_result, numeric_cols)
             fig = px.imshow(
                 corr_data,
                 title=f"{query_title} - Correlation Heatmap",
@@ -211,7 +578,7 @@ def create_query_visualization(df_result, query_title):
         else:
             # Default to bar chart
             fig = px.bar(
-                df_result.head(10), 
+                df10, 
                 x=x_axis, 
                 y=y_axis,
                 title=f"{query_title} - Data Visualization"
@@ -231,6 +598,58 @@ def create_query_visualization(df_result, query_title):
         st.warning(f"Visualization error: {viz_error}")
         st.info("Try selecting different columns or chart types for better visualization.")
 
+# Export serializers - st.download_button needs the bytes up front on every
+# rerun, so cache them keyed on the result DataFrame
+@st.cache_data(show_spinner=False)
+def _to_csv(df):
+    """CSV export bytes"""
+    return df.to_csv(index=False).encode()
+
+@st.cache_data(show_spinner=False)
+def _to_json(df):
+    """JSON (records) export bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            df.to_dict(orient='records'),
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+            default=_json_default
+        )
+    return df.to_json(orient='records', indent=2).encode()
+
+def _json_default(value):
+    """orjson fallback for values it cannot encode natively (pd.NA, timestamps)"""
+    return None if value is pd.NA else str(value)
+
+@st.cache_data(show_spinner=False)
+def _to_xlsx(df):
+    """Excel export bytes (xlsxwriter, openpyxl fallback)"""
+    output = BytesIO()
+    # No constant_memory: to_excel writes column by column, and xlsxwriter's
+    # streaming mode silently drops cells written to an already-flushed row
+    with pd.ExcelWriter(output, engine='xlsxwriter' if XLSXWRITER_AVAILABLE else 'openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Query_Results')
+    return output.getvalue()
+
+def _downsample_minmax(df, x_col, y_col, max_points=AppConfig.MAX_PLOT_POINTS):
+    """
+    Reduce a large result to at most max_points rows before plotting.
+    Rows are sorted on x and split into equal buckets along it; each bucket
+    keeps its min and max y row (M4-style), so extremes survive while the
+    Plotly payload stays small.
+    """
+    if len(df) <= max_points:
+        return df
+    
+    # Rows missing x or y are not drawn anyway, and would leave all-NA buckets for idxmin/idxmax
+    plotted = df[df[x_col].notna() & df[y_col].notna()].sort_values(x_col, kind='stable')
+    if len(plotted) <= max_points:
+        return plotted
+    
+    buckets = np.arange(len(plotted)) * (max_points // 2) // len(plotted)
+    grouped = plotted[y_col].reset_index(drop=True).groupby(buckets)
+    keep = pd.concat([grouped.idxmin(), grouped.idxmax()]).unique()
+    return plotted.iloc[np.sort(keep)]
+
 def create_export_options(df_result, query_title):
     """Create export functionality for query results"""
     st.markdown("### 💾 Export Results")
@@ -239,49 +658,40 @@ def create_export_options(df_result, query_title):
     
     with col1:
         # CSV download
-        csv = df_result.to_csv(index=False)
         st.download_button(
             label="📄 Download CSV",
-            data=csv,
+            data=_to_csv(df_result),
             file_name=f"{query_title.replace(' ', '_')}.csv",
             mime="text/csv"
         )
     
     with col2:
         # JSON download
-        json_str = df_result.to_json(orient='records', indent=2)
         st.download_button(
             label="📋 Download JSON",
-            data=json_str,
+            data=_to_json(df_result),
             file_name=f"{query_title.replace(' ', '_')}.json",
             mime="application/json"
         )
     
     with col3:
-        # Excel download (requires openpyxl)
+        # Excel download (requires xlsxwriter or openpyxl)
         try:
-            from io import BytesIO
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                df_result.to_excel(writer, index=False, sheet_name='Query_Results')
-            excel_data = output.getvalue()
-            
             st.download_button(
                 label="📊 Download Excel",
-                data=excel_data,
+                data=_to_xlsx(df_result),
                 file_name=f"{query_title.replace(' ', '_')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
         except ImportError:
-            st.info("Excel export requires openpyxl package")
+            st.info("Excel export requires the xlsxwriter or openpyxl package")
 
-def show_query_insights(selected_query, df_result):
+def show_query_insights(selected_query, df_result, numeric_cols):
     """Show insights and learning points for the executed query"""
     st.markdown("### 💡 Query Insights")
     
     # Get insights from SQL queries class
-    sql_queries_class = SQLQueries(DatabaseManager())
-    insights = sql_queries_class.get_query_insights()
+    insights = get_query_insights()
     
     insight = insights.get(selected_query, "This query demonstrates advanced SQL techniques for cricket analytics.")
     
@@ -297,7 +707,6 @@ def show_query_insights(selected_query, df_result):
             st.metric("Total Records", len(df_result))
         
         with col2:
-            numeric_cols = df_result.select_dtypes(include=[np.number]).columns
             st.metric("Numeric Columns", len(numeric_cols))
         
         with col3:
@@ -306,64 +715,15 @@ def show_query_insights(selected_query, df_result):
         # Show data types and basic statistics
         if len(numeric_cols) > 0:
             with st.expander("📈 Statistical Summary"):
-                st.dataframe(df_result[numeric_cols].describe())
+                st.dataframe(_describe(df_result, numeric_cols))
 
 def show_query_categories():
     """Display overview of all query categories"""
     st.header("📋 SQL Query Categories Overview")
     
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown(create_stat_card("""
-        <h3>🟢 Beginner (Questions 1-8)</h3>
-        <h4>Core SQL Fundamentals</h4>
-        <ul>
-        <li>Basic SELECT statements</li>
-        <li>WHERE clause filtering</li>
-        <li>ORDER BY and GROUP BY</li>
-        <li>Simple aggregate functions</li>
-        <li>Date/time operations</li>
-        <li>String manipulations</li>
-        <li>DISTINCT operations</li>
-        <li>Basic table joins</li>
-        </ul>
-        <p><em>Perfect for SQL beginners and foundational concepts</em></p>
-        """), unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(create_stat_card("""
-        <h3>🟡 Intermediate (Questions 9-16)</h3>
-        <h4>Advanced Query Techniques</h4>
-        <ul>
-        <li>Complex JOINs (INNER, LEFT, RIGHT)</li>
-        <li>Subqueries and correlated queries</li>
-        <li>CASE statements</li>
-        <li>Advanced GROUP BY with HAVING</li>
-        <li>Multiple table analysis</li>
-        <li>Conditional aggregations</li>
-        <li>Data transformation</li>
-        <li>Performance analysis queries</li>
-        </ul>
-        <p><em>Builds on fundamentals with real-world complexity</em></p>
-        """), unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(create_stat_card("""
-        <h3>🔴 Advanced (Questions 17-25)</h3>
-        <h4>Expert-Level Analytics</h4>
-        <ul>
-        <li>Window functions (ROW_NUMBER, RANK)</li>
-        <li>Common Table Expressions (CTEs)</li>
-        <li>Statistical calculations</li>
-        <li>Time-series analysis</li>
-        <li>LAG/LEAD functions</li>
-        <li>Complex business logic</li>
-        <li>Performance ranking systems</li>
-        <li>Predictive analytics queries</li>
-        </ul>
-        <p><em>Professional-level SQL for data analysis</em></p>
-        """), unsafe_allow_html=True)
+    for col, card_html in zip(st.columns(3), _CATEGORY_CARDS):
+        with col:
+            st.markdown(card_html, unsafe_allow_html=True)
 
 def show_learning_guide():
     """Display SQL learning guide and best practices"""
@@ -374,179 +734,15 @@ def show_learning_guide():
     
     learning_tabs = st.tabs(["🌱 Getting Started", "📈 Building Skills", "🚀 Mastery", "💼 Best Practices"])
     
-    with learning_tabs[0]:
-        st.markdown("""
-        ### 🌱 Getting Started with SQL
-        
-        **Step 1: Understand the Database Schema**
-        ```sql
-        -- Explore tables and their structure
-        SELECT name FROM sqlite_master WHERE type='table';
-        
-        -- Check table columns
-        PRAGMA table_info(players);
-        ```
-        
-        **Step 2: Basic SELECT Queries**
-        ```sql
-        -- Simple data retrieval
-        SELECT name, country FROM players LIMIT 5;
-        
-        -- Filtering data
-        SELECT * FROM players WHERE country = 'India';
-        ```
-        
-        **Step 3: Sorting and Grouping**
-        ```sql
-        -- Sort results
-        SELECT name, total_runs FROM players ORDER BY total_runs DESC;
-        
-        -- Group and aggregate
-        SELECT country, COUNT(*) FROM players GROUP BY country;
-        ```
-        
-        **🎯 Practice Queries:** Start with Questions 1-4 for basic concepts.
-        """)
-    
-    with learning_tabs[1]:
-        st.markdown("""
-        ### 📈 Building Advanced Skills
-        
-        **JOINs - Connecting Related Data**
-        ```sql
-        -- INNER JOIN example
-        SELECT p.name, m.match_description 
-        FROM players p 
-        INNER JOIN player_performances pp ON p.id = pp.player_id
-        INNER JOIN matches m ON pp.match_id = m.id;
-        ```
-        
-        **Subqueries - Queries within Queries**
-        ```sql
-        -- Find players with above-average runs
-        SELECT name, total_runs 
-        FROM players 
-        WHERE total_runs > (SELECT AVG(total_runs) FROM players);
-        ```
-        
-        **CASE Statements - Conditional Logic**
-        ```sql
-        -- Categorize players by performance
-        SELECT name,
-            CASE 
-                WHEN batting_average >= 50 THEN 'Excellent'
-                WHEN batting_average >= 35 THEN 'Good'
-                ELSE 'Average'
-            END as performance_category
-        FROM players;
-        ```
-        
-        **🎯 Practice Queries:** Work through Questions 9-12 for JOIN mastery.
-        """)
-    
-    with learning_tabs[2]:
-        st.markdown("""
-        ### 🚀 Advanced Mastery
-        
-        **Window Functions - Advanced Analytics**
-        ```sql
-        -- Rank players by runs with ties
-        SELECT name, total_runs,
-            RANK() OVER (ORDER BY total_runs DESC) as rank
-        FROM players;
-        
-        -- Running totals and moving averages
-        SELECT name, total_runs,
-            SUM(total_runs) OVER (ORDER BY total_runs) as running_total
-        FROM players;
-        ```
-        
-        **Common Table Expressions (CTEs)**
-        ```sql
-        -- Complex multi-step analysis
-        WITH top_batsmen AS (
-            SELECT name, total_runs, batting_average
-            FROM players 
-            WHERE total_runs > 5000
-        )
-        SELECT * FROM top_batsmen 
-        WHERE batting_average > 40;
-        ```
-        
-        **Statistical Analysis**
-        ```sql
-        -- Calculate standard deviation for consistency
-        SELECT name,
-            SQRT(AVG(runs_scored * runs_scored) - AVG(runs_scored) * AVG(runs_scored)) as consistency
-        FROM player_performances pp
-        JOIN players p ON pp.player_id = p.id
-        GROUP BY name;
-        ```
-        
-        **🎯 Practice Queries:** Master Questions 17-25 for expert-level skills.
-        """)
-    
-    with learning_tabs[3]:
-        st.markdown("""
-        ### 💼 SQL Best Practices
-        
-        **Performance Optimization**
-        - Use indexes on frequently queried columns
-        - Limit results with LIMIT clause when appropriate
-        - Use EXISTS instead of IN for better performance
-        - Avoid SELECT * in production queries
-        
-        **Code Quality**
-        ```sql
-        -- Good: Clear, readable formatting
-        SELECT 
-            p.name,
-            p.country,
-            COUNT(pp.id) as matches_played,
-            AVG(pp.runs_scored) as avg_runs
-        FROM players p
-        LEFT JOIN player_performances pp ON p.id = pp.player_id
-        WHERE p.country IN ('India', 'Australia')
-        GROUP BY p.name, p.country
-        HAVING COUNT(pp.id) >= 5
-        ORDER BY avg_runs DESC;
-        ```
-        
-        **Error Handling**
-        - Always check for NULL values with appropriate handling
-        - Use COALESCE or CASE for NULL replacements
-        - Validate data types in calculations
-        - Include meaningful aliases for readability
-        
-        **Documentation**
-        - Comment complex queries
-        - Use meaningful table and column aliases
-        - Document business logic in query comments
-        - Maintain consistent formatting style
-        """)
+    for tab, tab_body in zip(learning_tabs, _LEARNING_TABS):
+        with tab:
+            st.markdown(tab_body)
 
 def show_default_content():
     """Show default content when no query is selected"""
     st.subheader("📋 SQL Query Practice Overview")
     
-    st.markdown("""
-    Welcome to the SQL Analytics section! This implements all **25 practice questions** from the assignment.
-    
-    ### 🎯 Learning Objectives
-    - Master different SQL concepts from basic to advanced
-    - Practice with real cricket data scenarios
-    - Understand database analytics in sports domain
-    - Learn query optimization and complex joins
-    
-    ### 📊 How to Use This Section
-    1. **Select Difficulty Level** from the sidebar (Beginner, Intermediate, or Advanced)
-    2. **Choose a Query** from the dropdown list
-    3. **Click 'Execute Query'** to run the SQL statement
-    4. **View Results** in the data table below
-    5. **Explore Visualizations** for better insights
-    6. **Check SQL Code** to understand the implementation
-    7. **Download Results** in CSV, JSON, or Excel format
-    """)
+    st.markdown(_DEFAULT_INTRO)
     
     # Quick stats about available queries
     col1, col2, col3, col4 = st.columns(4)
@@ -568,126 +764,23 @@ def show_default_content():
     # Sample queries showcase
     st.subheader("🔥 Featured Queries")
     
-    featured_cols = st.columns(3)
-    
-    with featured_cols[0]:
-        st.markdown(create_stat_card("""
-        <h4>🟢 Beginner Highlight</h4>
-        <h5>Q3: Top 10 Run Scorers</h5>
-        <p>Perfect introduction to ORDER BY and LIMIT clauses. Learn basic ranking and data limitation techniques.</p>
-        <code>ORDER BY total_runs DESC LIMIT 10</code>
-        """), unsafe_allow_html=True)
-    
-    with featured_cols[1]:
-        st.markdown(create_stat_card("""
-        <h4>🟡 Intermediate Highlight</h4>
-        <h5>Q11: Multi-Format Performance</h5>
-        <p>Master CASE statements with JOINs for cross-format analysis. Essential for sports analytics.</p>
-        <code>CASE WHEN match_format = 'Test'...</code>
-        """), unsafe_allow_html=True)
-    
-    with featured_cols[2]:
-        st.markdown(create_stat_card("""
-        <h4>🔴 Advanced Highlight</h4>
-        <h5>Q25: Career Trajectory Analysis</h5>
-        <p>Expert-level time-series analysis with LAG functions and trend calculations. Professional analytics.</p>
-        <code>LAG(avg_runs) OVER (ORDER BY...)</code>
-        """), unsafe_allow_html=True)
+    for col, card_html in zip(st.columns(3), _FEATURED_CARDS):
+        with col:
+            st.markdown(card_html, unsafe_allow_html=True)
     
     # Database schema quick reference
     st.markdown("---")
     st.subheader("🗄️ Database Schema Quick Reference")
     
-    schema_tabs = st.tabs(["Players", "Matches", "Performances", "Series"])
-    
-    with schema_tabs[0]:
-        st.markdown("""
-        **Players Table Structure:**
-        ```sql
-        CREATE TABLE players (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            country TEXT,
-            playing_role TEXT,
-            batting_style TEXT,
-            bowling_style TEXT,
-            total_runs INTEGER,
-            batting_average REAL,
-            centuries INTEGER,
-            wickets_taken INTEGER,
-            bowling_average REAL,
-            economy_rate REAL,
-            catches INTEGER,
-            stumpings INTEGER,
-            matches_played INTEGER
-        );
-        ```
-        """)
-    
-    with schema_tabs[1]:
-        st.markdown("""
-        **Matches Table Structure:**
-        ```sql
-        CREATE TABLE matches (
-            id INTEGER PRIMARY KEY,
-            match_description TEXT,
-            team1 TEXT,
-            team2 TEXT,
-            venue_name TEXT,
-            venue_city TEXT,
-            venue_country TEXT,
-            venue_capacity INTEGER,
-            match_date DATE,
-            match_format TEXT,
-            winning_team TEXT,
-            victory_margin INTEGER,
-            victory_type TEXT,
-            toss_winner TEXT,
-            toss_decision TEXT
-        );
-        ```
-        """)
+    schema_tabs = st.tabs([tab for tab, _heading, _table in _SCHEMA_TABS])
     
-    with schema_tabs[2]:
-        st.markdown("""
-        **Player Performances Table:**
-        ```sql
-        CREATE TABLE player_performances (
-            id INTEGER PRIMARY KEY,
-            player_id INTEGER,
-            match_id INTEGER,
-            runs_scored INTEGER,
-            balls_faced INTEGER,
-            strike_rate REAL,
-            wickets_taken INTEGER,
-            overs_bowled REAL,
-            runs_conceded INTEGER,
-            batting_position INTEGER,
-            FOREIGN KEY (player_id) REFERENCES players(id),
-            FOREIGN KEY (match_id) REFERENCES matches(id)
-        );
-        ```
-        """)
-    
-    with schema_tabs[3]:
-        st.markdown("""
-        **Series Table Structure:**
-        ```sql
-        CREATE TABLE series (
-            id INTEGER PRIMARY KEY,
-            series_name TEXT,
-            host_country TEXT,
-            match_type TEXT,
-            start_date DATE,
-            total_matches INTEGER
-        );
-        ```
-        """)
+    for tab, schema_doc in zip(schema_tabs, _schema_docs()):
+        with tab:
+            st.markdown(schema_doc)
     
     # Quick database statistics
     try:
-        db_manager = DatabaseManager()
-        stats = db_manager.get_table_stats()
+        stats = get_db_manager().get_table_stats()
         
         if stats:
             st.markdown("### 📈 Current Database Statistics")
@@ -706,29 +799,36 @@ def show_default_content():
         st.info("Database statistics will be available once the database is initialized.")
 
 # Additional utility functions for the SQL Analytics page
+
+# Commas and clause keywords that format_sql_code breaks onto new lines
+_SQL_FORMAT_RE = re.compile(r'(,|\bFROM\b|\bWHERE\b|\bGROUP BY\b|\bORDER BY\b|\bHAVING\b)')
+
+# Keywords weighted by get_query_complexity_score
+_COMPLEXITY_KW_RE = re.compile(r'\b(JOIN|SELECT|CASE|OVER|WITH)\b', re.IGNORECASE)
+
 def format_sql_code(sql_code):
     """Format SQL code for better display"""
     # Basic SQL formatting (could be enhanced with sqlparse library)
-    formatted = sql_code.replace(',', ',\n    ')
-    formatted = formatted.replace('FROM', '\nFROM')
-    formatted = formatted.replace('WHERE', '\nWHERE')
-    formatted = formatted.replace('GROUP BY', '\nGROUP BY')
-    formatted = formatted.replace('ORDER BY', '\nORDER BY')
-    formatted = formatted.replace('HAVING', '\nHAVING')
-    return formatted
+    return _SQL_FORMAT_RE.sub(_format_sql_token, sql_code)
+
+def _format_sql_token(match):
+    """Line-break replacement for a single comma or clause keyword"""
+    token = match.group(1)
+    return ',\n    ' if token == ',' else '\n' + token
 
 def get_query_complexity_score(sql_code):
     """Calculate complexity score for SQL query"""
-    score = 0
+    # Count different SQL elements in a single pass over the text
+    counts = Counter(m.group(1).upper() for m in _COMPLEXITY_KW_RE.finditer(sql_code))
     
-    # Count different SQL elements
-    joins = sql_code.upper().count('JOIN')
-    subqueries = sql_code.upper().count('SELECT') - 1  # Subtract main SELECT
-    case_statements = sql_code.upper().count('CASE')
-    window_functions = sql_code.upper().count('OVER')
-    ctes = sql_code.upper().count('WITH')
+    joins = counts['JOIN']
+    subqueries = counts['SELECT'] - 1  # Subtract main SELECT
+    case_statements = counts['CASE']
+    window_functions = counts['OVER']
+    ctes = counts['WITH']
     
     # Calculate score
+    score = 0
     score += joins * 2
     score += subqueries * 3
     score += case_statements * 2
@@ -740,9 +840,8 @@ def get_query_complexity_score(sql_code):
 def show_execution_plan(query):
     """Show query execution plan for learning purposes"""
     try:
-        db_manager = DatabaseManager()
         plan_query = f"EXPLAIN QUERY PLAN {query}"
-        plan_result = db_manager.execute_query(plan_query)
+        plan_result = get_db_manager().execute_query_df(plan_query)
         
         if not plan_result.empty:
             st.subheader("🔧 Query Execution Plan")
@@ -0,0 +1,103 @@
+# tests/test_database_manager.py
+# Tests for DatabaseManager's schema upgrades, cascades and resets
+
+import sqlite3
+
+import pytest
+from utils.database_manager import DatabaseManager, _PERFORMANCES_TABLE_SQL
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of a new sample-data database, closed again so tests can reopen it"""
+    path = str(tmp_path / "cricket.db")
+    DatabaseManager(path).close()
+    return path
+
+
+def _performance_rows(conn):
+    return conn.execute("SELECT * FROM player_performances ORDER BY id").fetchall()
+
+
+def _on_delete_actions(conn):
+    return {fk[2]: fk[6] for fk in conn.execute("PRAGMA foreign_key_list(player_performances)")}
+
+
+def test_deleting_a_record_cascades_to_performances(db_path):
+    db = DatabaseManager(db_path)
+    try:
+        player_id, match_id = db.execute_query_raw("SELECT player_id, match_id FROM player_performances LIMIT 1")[0]
+        assert db.delete_record('players', player_id) == 1
+        assert db.delete_record('matches', match_id) == 1
+        
+        assert db.execute_query_raw(
+            "SELECT COUNT(*) FROM player_performances WHERE player_id = ? OR match_id = ?", (player_id, match_id)
+        )[0][0] == 0
+        assert db.execute_query_raw("PRAGMA foreign_key_check") == []
+    finally:
+        db.close()
+
+
+def test_legacy_performances_table_is_rebuilt_with_cascade(db_path):
+    # Recreate the pre-cascade table definition around the seeded rows
+    conn = sqlite3.connect(db_path)
+    expected = _performance_rows(conn)
+    conn.executescript(f"""
+        ALTER TABLE player_performances RENAME TO old_performances;
+        {_PERFORMANCES_TABLE_SQL.replace(' ON DELETE CASCADE', '')};
+        INSERT INTO player_performances SELECT * FROM old_performances;
+        DROP TABLE old_performances;
+    """)
+    assert set(_on_delete_actions(conn).values()) == {'NO ACTION'}
+    conn.close()
+    
+    db = DatabaseManager(db_path)
+    try:
+        conn = db.get_connection()
+        assert _on_delete_actions(conn) == {'players': 'CASCADE', 'matches': 'CASCADE'}
+        assert _performance_rows(conn) == expected
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'player_performances_legacy'").fetchall() == []
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'ix_perf_batting_order'").fetchall() == [(1,)]
+    finally:
+        db.close()
+
+
+def test_interrupted_rebuild_is_resumed(db_path):
+    # A rebuild that stopped after creating the new table but before copying every row
+    conn = sqlite3.connect(db_path)
+    expected = _performance_rows(conn)
+    conn.executescript("""
+        CREATE TABLE player_performances_legacy AS SELECT * FROM player_performances;
+        DELETE FROM player_performances WHERE id > 5;
+    """)
+    conn.close()
+    
+    db = DatabaseManager(db_path)
+    try:
+        conn = db.get_connection()
+        assert _performance_rows(conn) == expected
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'player_performances_legacy'").fetchall() == []
+    finally:
+        db.close()
+
+
+def test_reset_restores_each_database_from_its_own_seed(tmp_path):
+    db = DatabaseManager(str(tmp_path / "cricket.db"))
+    other_db = DatabaseManager(str(tmp_path / "other.db"))
+    try:
+        seeded = db.execute_query_raw("SELECT * FROM players ORDER BY id")
+        
+        for manager in (db, other_db):
+            assert manager.delete_record('players', seeded[0][0]) == 1
+            manager.insert_record('players', {'name': 'Added Player'})
+        
+        assert db.reset_database()
+        assert db.execute_query_raw("SELECT * FROM players ORDER BY id") == seeded
+        assert db.execute_query_raw("SELECT COUNT(*) FROM player_performances")[0][0] == 10
+        
+        # The other database keeps its edits
+        assert other_db.execute_query_raw("SELECT COUNT(*) FROM players WHERE name = 'Added Player'")[0][0] == 1
+        assert other_db.execute_query_raw("SELECT COUNT(*) FROM players")[0][0] == len(seeded)
+    finally:
+        db.close()
+        other_db.close()
@@ -0,0 +1,30 @@
+# tests/test_player_stats.py
+# Tests for the player statistics page's rankings loaders
+
+from pages.player_stats import _UNRECOGNIZED_NOTICE, load_batting_df, load_bowling_df
+
+
+class _RankingsClient:
+    """Stands in for CricbuzzAPIClient, serving one canned rankings payload"""
+    
+    def __init__(self, payload):
+        self.payload = payload
+    
+    def get_batting_rankings(self, format_type="odi"):
+        return self.payload
+    
+    def get_bowling_rankings(self, format_type="odi"):
+        return self.payload
+
+
+def test_loaders_return_parsed_frame_without_raw_payload():
+    payload = {'rank': [{'name': 'Joe Root', 'country': 'England', 'points': 890, 'rating': 890}]}
+    for loader in (load_batting_df, load_bowling_df):
+        df, fetched, notice = loader(_RankingsClient(payload), "test")
+        assert fetched and notice is None
+        assert df['Player'].tolist() == ['Joe Root']
+
+
+def test_loaders_hand_back_notices():
+    assert load_batting_df(_RankingsClient({'unexpected': 1}), "odi") == (None, True, _UNRECOGNIZED_NOTICE)
+    assert load_bowling_df(_RankingsClient(None), "t20") == (None, False, None)
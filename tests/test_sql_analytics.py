@@ -0,0 +1,52 @@
+# tests/test_sql_analytics.py
+# Tests for the SQL analytics page helpers
+
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+import pages.sql_analytics as sql_analytics
+from pages.sql_analytics import _SCHEMA_TABS, _downsample_minmax, _to_xlsx
+from utils.database_manager import DatabaseManager
+
+
+def test_xlsx_export_round_trips():
+    pytest.importorskip("openpyxl")
+    df = pd.DataFrame({
+        'Player': ['Kohli', 'Root', 'Smith', 'Williamson'],
+        'Runs': [12000, 11000, 9500, 8000],
+        'Average': [57.3, 49.1, 58.6, 54.3],
+    })
+    
+    result = pd.read_excel(BytesIO(_to_xlsx(df)), sheet_name='Query_Results')
+    pd.testing.assert_frame_equal(result, df)
+
+
+def test_downsample_buckets_along_x():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'x': rng.permutation(5000).astype(float), 'y': rng.normal(size=5000)})
+    df.loc[df.index[:500], 'y'] = np.nan  # a whole leading bucket's worth of missing y
+    
+    result = _downsample_minmax(df, 'x', 'y', max_points=100)
+    assert len(result) <= 100
+    assert result['x'].is_monotonic_increasing
+    assert result['y'].notna().all()
+    assert result['y'].max() == df['y'].max() and result['y'].min() == df['y'].min()
+    
+    small = df.head(50)
+    assert _downsample_minmax(small, 'x', 'y', max_points=100) is small
+
+
+def test_schema_reference_matches_the_database(tmp_path, monkeypatch):
+    db = DatabaseManager(str(tmp_path / "cricket.db"))
+    monkeypatch.setattr(sql_analytics, 'get_db_manager', lambda: db)
+    try:
+        docs = dict(zip((table for _tab, _heading, table in _SCHEMA_TABS), sql_analytics._schema_docs()))
+    finally:
+        db.close()
+    
+    assert "CREATE TABLE teams (" in docs['teams']
+    assert "REFERENCES players(id) ON DELETE CASCADE" in docs['player_performances']
+    assert "REFERENCES matches(id) ON DELETE CASCADE" in docs['player_performances']
+    assert all("not found" not in doc for doc in docs.values())
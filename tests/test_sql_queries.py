@@ -0,0 +1,131 @@
+# tests/test_sql_queries.py
+# Tests for the SQL analytics queries against a freshly seeded database
+
+from datetime import date, timedelta
+
+import pytest
+from utils.database_manager import DatabaseManager
+from utils.sql_queries import SQLQueries, _sql_round
+
+
+@pytest.fixture
+def sql_queries(tmp_path):
+    """SQLQueries bound to a new sample-data database"""
+    db = DatabaseManager(str(tmp_path / "cricket.db"))
+    yield SQLQueries(db)
+    db.close()
+
+
+def test_lazy_projects_requested_columns(sql_queries):
+    lazy = sql_queries.lazy("Q1: All Players from India")
+    assert lazy.columns == ['Player Name', 'Playing Role', 'Batting Style', 'Bowling Style']
+    
+    df = lazy.head(3, ['Player Name', 'Playing Role'])
+    assert list(df.columns) == ['Player Name', 'Playing Role']
+    assert 0 < len(df) <= 3
+    
+    full, _, _ = sql_queries.query_1_indian_players()
+    assert df['Player Name'].tolist() == full['Player Name'].head(len(df)).tolist()
+
+
+def test_lazy_rejects_unknown_columns(sql_queries):
+    with pytest.raises(ValueError):
+        sql_queries.lazy("Q1: All Players from India").head(5, ['No Such Column'])
+
+
+def test_lazy_excludes_hand_written_queries(sql_queries):
+    with pytest.raises(KeyError):
+        sql_queries.lazy("Q21: Performance Ranking System")
+
+
+def test_cache_key_tracks_database_and_writes(tmp_path):
+    # Query results are cached on cache_key, so it must differ per file and move on every write
+    other_db = DatabaseManager(str(tmp_path / "other.db"))
+    db = DatabaseManager(str(tmp_path / "cricket.db"))
+    try:
+        assert db.cache_key[0] != other_db.cache_key[0]
+        other_key = other_db.cache_key
+        
+        keys = [db.cache_key]
+        top_id = db.execute_query_raw("SELECT id FROM players ORDER BY total_runs DESC LIMIT 1")[0][0]
+        assert db.update_record('players', top_id, {'name': 'Renamed Player'}) == 1
+        keys.append(db.cache_key)
+        assert SQLQueries(db).query_3_top_run_scorers()[0]['Player Name'].iloc[0] == 'Renamed Player'
+        
+        record_id = db.insert_record('series', {'series_name': 'Test Series'})
+        keys.append(db.cache_key)
+        assert db.delete_record('series', record_id) == 1
+        keys.append(db.cache_key)
+        assert db.reset_database()
+        keys.append(db.cache_key)
+        
+        assert len(set(keys)) == len(keys)
+        assert other_db.cache_key == other_key
+        # A second manager on the same file shares its write version
+        assert DatabaseManager(db.db_path).cache_key == db.cache_key
+    finally:
+        db.close()
+        other_db.close()
+
+
+def test_career_trajectory_keeps_same_named_players_apart(sql_queries):
+    db = sql_queries.db
+    rising = db.insert_record('players', {'name': 'Same Name', 'country': 'India'})
+    falling = db.insert_record('players', {'name': 'Same Name', 'country': 'England'})
+    # Five quarters of form, 100 days apart so every match lands in its own quarter
+    for k, runs in enumerate((10, 20, 40, 80, 160)):
+        match_id = db.insert_record('matches', {
+            'match_description': f'Trajectory match {k}',
+            'match_date': (date.today() - timedelta(days=100 * (4 - k))).isoformat(),
+        })
+        db.insert_record('player_performances', {'player_id': rising, 'match_id': match_id, 'runs_scored': runs})
+        db.insert_record('player_performances', {'player_id': falling, 'match_id': match_id, 'runs_scored': 170 - runs})
+    
+    df = sql_queries.query_25_career_trajectory()[0]
+    same = df[df['Player'] == 'Same Name']
+    assert sorted(same['Career Trajectory'].tolist()) == ['Career Ascending', 'Career Declining']
+    assert same['Quarters with Data'].tolist() == [4, 4]
+
+
+def test_century_partnerships_on_sample_data(sql_queries):
+    df = sql_queries.query_13_partnerships()[0]
+    assert df.values.tolist() == [
+        ['Virat Kohli', 'Rohit Sharma', 209, 'India vs Australia, 1st ODI'],
+        ['Virat Kohli', 'Joe Root', 112, 'England vs New Zealand, T20I'],
+    ]
+
+
+def test_batting_partnerships_count_each_pair_once(sql_queries):
+    # The sample data has each pair batting together once, which no longer
+    # passes HAVING COUNT(*) >= 2 now that pairs aren't counted in both directions
+    assert sql_queries.query_24_batting_partnerships()[0].empty
+    
+    db = sql_queries.db
+    kohli, rohit = (db.execute_query_raw("SELECT id FROM players WHERE name = ?", (name,))[0][0]
+                    for name in ('Virat Kohli', 'Rohit Sharma'))
+    match_id = db.insert_record('matches', {'match_description': 'Partnership match'})
+    db.insert_record('player_performances', {'player_id': rohit, 'match_id': match_id, 'runs_scored': 30, 'batting_position': 1})
+    db.insert_record('player_performances', {'player_id': kohli, 'match_id': match_id, 'runs_scored': 20, 'batting_position': 2})
+    
+    df = sql_queries.query_24_batting_partnerships()[0]
+    assert df.values.tolist() == [['Rohit Sharma & Virat Kohli', 2, 129.5, 209, 2, 100.0]]
+
+
+def test_performance_ranking_on_sample_data(sql_queries):
+    df = sql_queries.query_21_performance_ranking()[0]
+    assert list(df.columns) == ['Player', 'Country', 'Role', 'Overall Performance Rating']
+    assert len(df) == 15
+    assert df.head(3).values.tolist() == [
+        ['Trent Boult', 'New Zealand', 'Bowler', 824.7],
+        ['Ravindra Jadeja', 'India', 'All-rounder', 723.89],
+        ['MS Dhoni', 'India', 'Wicket-keeper', 692.02],
+    ]
+    assert df['Overall Performance Rating'].is_monotonic_decreasing
+    
+    # A smaller limit keeps the same leaders
+    assert sql_queries.query_21_performance_ranking(limit=3)[0].values.tolist() == df.head(3).values.tolist()
+
+
+@pytest.mark.parametrize("value", [2.675, -2.675, 1.005, 0.125, 450.685, 12.3449999, -0.005, 0.0])
+def test_sql_round_matches_sqlite(sql_queries, value):
+    assert _sql_round(value) == sql_queries.db.execute_query_raw("SELECT ROUND(?, 2)", (value,))[0][0]
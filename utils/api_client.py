@@ -1,36 +1,208 @@
 import requests
 import json
 import time
+import threading
+from datetime import timedelta
+from bisect import bisect_left
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config.app_config import AppConfig
 
+# orjson parses the rankings payloads several times faster than the stdlib json
+# behind response.json() and reads the raw bytes without decoding to str first
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter
+    Allows bursts of up to `capacity` requests, refilling at `refill_rate` tokens per second
+    """
+    
+    def __init__(self, capacity=5, refill_rate=1.0):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping only when the bucket is empty"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+            
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            
+            # Wait just long enough for the next token, then spend it; the refill
+            # point is derived from the single clock read above instead of re-reading it
+            wait = (1 - self.tokens) / self.refill_rate
+            time.sleep(wait)
+            self.tokens = 0.0
+            self.last_refill = now + wait
+
+def _ttl_cache(ttl):
+    """
+    Memoize an idempotent GET method for `ttl` seconds
+    Hits are served from memory and never touch the rate limiter; failed (None) responses are not cached
+    """
+    def decorator(fn):
+        cache = {}
+        
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            entry = cache.get(key)
+            if entry and now - entry[0] < ttl:
+                return entry[1]
+            
+            value = fn(self, *args, **kwargs)
+            if value is not None:
+                cache[key] = (now, value)
+            return value
+        
+        return wrapper
+    return decorator
+
+# requests-cache keeps responses in a SQLite file so they survive Streamlit
+# reloads and process restarts, honouring Cache-Control/ETag on its own
+try:
+    from requests_cache import CachedSession
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+# Longest Retry-After (seconds) honoured for a 429 before giving up on the request
+_MAX_RETRY_AFTER = 30
+
+def _retry_after_seconds(response, default=1.0):
+    """Seconds to wait from a Retry-After header (delta-seconds form), else default"""
+    try:
+        return max(0.0, float(response.headers.get('Retry-After', default)))
+    except (TypeError, ValueError):
+        return default  # HTTP-date form or garbage
+
+class _CappedRetry(Retry):
+    """urllib3 Retry that never sleeps longer than _MAX_RETRY_AFTER for a Retry-After header"""
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, _MAX_RETRY_AFTER)
+
+# Keys a rankings payload may keep its player list under
+_RANKING_LIST_KEYS = ('rank', 'rankings', 'players', 'batsmen', 'bowlers', 'data', 'values')
+
+# Name indexes kept per client before the oldest are dropped (6 rankings payloads per refresh)
+_MAX_NAME_INDEXES = 32
+
+def _build_name_index(rankings_data):
+    """
+    Casefolded name -> player index for a rankings payload, plus the sorted names
+    The dict gives exact lookups and the sorted list gives bisect prefix lookups
+    """
+    players = next((rankings_data[k] for k in _RANKING_LIST_KEYS if isinstance(rankings_data.get(k), list)), [])
+    by_name = {}
+    for player in players:
+        if isinstance(player, dict):
+            name = player.get('name') or player.get('player')
+            if isinstance(name, str):
+                by_name.setdefault(name.casefold(), player)
+    return by_name, sorted(by_name)
+
 class CricbuzzAPIClient:
     """Client for interacting with Cricbuzz API"""
     
     def __init__(self):
         self.headers = AppConfig.get_api_headers()
-        self.last_request_time = 0
-        self.rate_limit_delay = 1  # 1 second between requests
+        self.rate_limiter = TokenBucket(capacity=5, refill_rate=1.0)  # bursts of 5, then 1 req/s
         self.base_url = AppConfig.BASE_API_URL
+        
+        # Persistent session so keep-alive reuses one TLS connection to the API host;
+        # disk-backed when requests-cache is installed, serving stale data if the API errors
+        if REQUESTS_CACHE_AVAILABLE:
+            self._session = CachedSession(
+                '.cache/http_cache',
+                backend='sqlite',
+                expire_after=timedelta(minutes=5),
+                cache_control=True,
+                allowable_methods=('GET',),
+                stale_if_error=True
+            )
+        else:
+            self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            # 429 is left to _make_request so its retry goes through the token bucket
+            max_retries=_CappedRetry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=frozenset(['GET']),
+                respect_retry_after_header=True,  # sleep what a 503 asks for, capped
+                raise_on_status=False  # hand the final response to _make_request's status handling
+            )
+        )
+        self._session.mount('https://', adapter)
+        
+        # Validators from earlier 200 responses, keyed by request: (etag, last_modified, payload)
+        self._etags = {}
+        
+        # Search indexes for rankings payloads, kept beside the (unmodified) cached payloads:
+        # id(payload) -> (payload, by_name, names); holding the payload keeps its id unique
+        self._name_indexes = {}
+    
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections"""
+        self._session.close()
     
-    def _make_request(self, endpoint, params=None):
+    def _make_request(self, endpoint, params=None, retries_left=1):
         """Make API request with rate limiting"""
         # Rate limiting
-        current_time = time.time()
-        if current_time - self.last_request_time < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - (current_time - self.last_request_time))
+        self.rate_limiter.acquire()
         
         # Construct full URL
         url = f"{self.base_url}{endpoint}" if not endpoint.startswith('http') else endpoint
         
+        # Replay stored validators so unchanged resources come back as a bodiless 304
+        cache_key = (url, tuple(sorted(params.items())) if params else ())
+        headers = dict(self.headers)
+        cached = self._etags.get(cache_key)
+        if cached:
+            if cached[0]:
+                headers['If-None-Match'] = cached[0]
+            if cached[1]:
+                headers['If-Modified-Since'] = cached[1]
+        
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            self.last_request_time = time.time()
+            response = self._session.get(url, headers=headers, params=params, timeout=(3.05, 10))
             
-            if response.status_code == 200:
-                return response.json()
+            if response.status_code == 304 and cached:
+                return cached[2]
+            elif response.status_code == 200:
+                payload = _json_loads(response.content)
+                etag = response.headers.get('ETag', '')
+                last_modified = response.headers.get('Last-Modified', '')
+                if etag or last_modified:
+                    self._etags[cache_key] = (etag, last_modified, payload)
+                return payload
             elif response.status_code == 429:
+                # Wait what the server asks for, within bounds, and try once more
+                retry_after = _retry_after_seconds(response)
+                if retries_left > 0 and retry_after <= _MAX_RETRY_AFTER:
+                    print(f"Rate limit exceeded. Retrying in {retry_after:.0f}s...")
+                    time.sleep(retry_after)
+                    return self._make_request(endpoint, params, retries_left - 1)
                 print("Rate limit exceeded. Please wait...")
-                time.sleep(60)  # Wait 1 minute
                 return None
             else:
                 print(f"API Error: {response.status_code}")
@@ -61,46 +233,63 @@ class CricbuzzAPIClient:
         except:
             return {'status': 'error', 'message': 'API connection failed'}
     
+    @_ttl_cache(30)
     def get_recent_matches(self):
         """Get recent matches"""
         return self._make_request("/matches/v1/recent")
     
+    @_ttl_cache(30)
     def get_live_matches(self):
         """Get live matches"""
         return self._make_request("/matches/v1/live")
     
+    @_ttl_cache(3600)
     def get_batting_rankings(self, format_type="odi"):
         """Get batting rankings"""
         return self._make_request("/stats/v1/rankings/batsmen", {"formatType": format_type})
     
+    @_ttl_cache(3600)
     def get_bowling_rankings(self, format_type="odi"):
         """Get bowling rankings"""
         return self._make_request("/stats/v1/rankings/bowlers", {"formatType": format_type})
     
+    @_ttl_cache(86400)
     def get_series_info(self):
         """Get series information"""
         return self._make_request("/series/v1/international")
     
+    @_ttl_cache(30)
     def get_match_details(self, match_id):
         """Get detailed match information"""
         return self._make_request(f"/mcenter/v1/{match_id}")
     
+    @_ttl_cache(86400)
     def get_player_info(self, player_id):
         """Get player information"""
         return self._make_request(f"/stats/v1/player/{player_id}")
     
     # NEW METHODS FOR PLAYER STATS PAGE
+    def _fetch_concurrently(self, calls):
+        """
+        Run independent (method, args) API calls in parallel and return their results in order
+        The shared session pool and token bucket still bound connections and request rate
+        """
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            futures = [executor.submit(method, *args) for method, args in calls]
+            return [future.result() for future in futures]
+    
     def get_player_rankings(self, format_type="test"):
         """Get player rankings - combines batting and bowling"""
         rankings_data = {}
         
-        # Get batting rankings
-        batting = self.get_batting_rankings(format_type)
+        # Batting and bowling rankings are independent - fetch both at once
+        batting, bowling = self._fetch_concurrently([
+            (self.get_batting_rankings, (format_type,)),
+            (self.get_bowling_rankings, (format_type,))
+        ])
+        
         if batting:
             rankings_data['batting'] = batting
-        
-        # Get bowling rankings  
-        bowling = self.get_bowling_rankings(format_type)
         if bowling:
             rankings_data['bowling'] = bowling
             
@@ -111,61 +300,93 @@ class CricbuzzAPIClient:
         # Since there's no direct search endpoint, we'll use the rankings to find players
         formats = ['test', 'odi', 't20']
         
-        for format_type in formats:
-            # Search in batting rankings
-            batting_data = self.get_batting_rankings(format_type)
-            if batting_data:
-                players = self._extract_players_from_rankings(batting_data, player_name)
-                if players:
-                    return players[0]  # Return first match
+        # Fetch batting and bowling rankings for every format at once and return
+        # as soon as any of them contains the player. Rankings are TTL-cached,
+        # so repeat searches are served from memory.
+        executor = ThreadPoolExecutor(max_workers=len(formats) * 2)
+        try:
+            futures = []
+            for format_type in formats:
+                futures.append(executor.submit(self.get_batting_rankings, format_type))
+                futures.append(executor.submit(self.get_bowling_rankings, format_type))
             
-            # Search in bowling rankings
-            bowling_data = self.get_bowling_rankings(format_type)
-            if bowling_data:
-                players = self._extract_players_from_rankings(bowling_data, player_name)
-                if players:
-                    return players[0]  # Return first match
+            for future in as_completed(futures):
+                rankings_data = future.result()
+                if rankings_data:
+                    players = self._extract_players_from_rankings(rankings_data, player_name)
+                    if players:
+                        return players[0]  # Return first match
+        finally:
+            # Don't wait on the slower lookups; ones already in flight still warm the cache
+            executor.shutdown(wait=False, cancel_futures=True)
         
         return None
     
+    def _name_index(self, rankings_data):
+        """(by_name, names) for a rankings payload, built once per cached payload"""
+        entry = self._name_indexes.get(id(rankings_data))
+        if entry is None or entry[0] is not rankings_data:
+            if len(self._name_indexes) >= _MAX_NAME_INDEXES:
+                self._name_indexes.clear()  # payloads from expired cache entries
+            entry = (rankings_data, *_build_name_index(rankings_data))
+            self._name_indexes[id(rankings_data)] = entry
+        return entry[1], entry[2]
+    
     def _extract_players_from_rankings(self, rankings_data, search_name):
         """Extract players matching search name from rankings data"""
+        if not isinstance(rankings_data, dict):
+            return []
+        search_key = search_name.casefold().strip()
+        if not search_key:
+            return []
+        by_name, names = self._name_index(rankings_data)
+        
+        # Exact name hit is a single dict lookup
+        player = by_name.get(search_key)
+        if player is not None:
+            return [player]
+        
+        # Then every name starting with the search text, located by bisecting the sorted names
         found_players = []
-        search_name_lower = search_name.lower()
+        for i in range(bisect_left(names, search_key), len(names)):
+            if not names[i].startswith(search_key):
+                break
+            found_players.append(by_name[names[i]])
+        if found_players:
+            return found_players
         
-        # This would need to be adapted based on your actual API response structure
-        # For now, returning empty list as we'd need to see the actual response format
-        return found_players
+        # Finally anywhere in the name, so "Kohli" still finds "Virat Kohli"
+        return [by_name[name] for name in names if search_key in name]
     
     def get_player_stats(self, player_id):
         """Get detailed player statistics"""
         return self.get_player_info(player_id)
     
+    def iter_team_players(self, team_name):
+        """Yield team entries from live matches involving team_name"""
+        team_name_lower = team_name.lower()
+        matches = self.get_live_matches() or {}
+        
+        for match_type in matches.get('typeMatches', ()):
+            for series in match_type.get('seriesMatches', ()):
+                for match in series.get('seriesAdWrapper', {}).get('matches', ()):
+                    match_info = match.get('matchInfo', {})
+                    
+                    # Check if team matches - lowercase each name once per match
+                    team1 = match_info.get('team1', {}).get('teamName', '')
+                    team2 = match_info.get('team2', {}).get('teamName', '')
+                    in_team1 = team_name_lower in team1.lower()
+                    
+                    if in_team1 or team_name_lower in team2.lower():
+                        yield {
+                            'team': team1 if in_team1 else team2,
+                            'match': match_info.get('matchDescription', ''),
+                            'venue': match_info.get('venueInfo', {}).get('city', '')
+                        }
+    
     def get_team_players(self, team_name):
         """Get players from a team - extract from live matches"""
-        matches = self.get_live_matches()
-        team_players = []
-        
-        if matches and 'typeMatches' in matches:
-            for match_type in matches['typeMatches']:
-                if 'seriesMatches' in match_type:
-                    for series in match_type['seriesMatches']:
-                        if 'matches' in series.get('seriesAdWrapper', {}):
-                            for match in series['seriesAdWrapper']['matches']:
-                                match_info = match.get('matchInfo', {})
-                                
-                                # Check if team matches
-                                team1 = match_info.get('team1', {}).get('teamName', '')
-                                team2 = match_info.get('team2', {}).get('teamName', '')
-                                
-                                if team_name.lower() in team1.lower() or team_name.lower() in team2.lower():
-                                    team_players.append({
-                                        'team': team1 if team_name.lower() in team1.lower() else team2,
-                                        'match': match_info.get('matchDescription', ''),
-                                        'venue': match_info.get('venueInfo', {}).get('city', '')
-                                    })
-        
-        return team_players
+        return list(self.iter_team_players(team_name))
 
 # Create a global instance
 api_client = CricbuzzAPIClient()
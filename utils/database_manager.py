@@ -3,20 +3,183 @@
 # Handles all database operations for Cricbuzz LiveStats
 
 import sqlite3
-import pandas as pd
 import os
+import threading
+import weakref
+from contextlib import contextmanager
+from functools import lru_cache, wraps
 from datetime import datetime
 from config.app_config import DatabaseConfig
 
+# Tables the CRUD helpers may touch - table names are interpolated into SQL, so anything else is rejected
+_ALLOWED_TABLES = frozenset({
+    DatabaseConfig.PLAYERS_TABLE,
+    DatabaseConfig.MATCHES_TABLE,
+    DatabaseConfig.SERIES_TABLE,
+    DatabaseConfig.PERFORMANCES_TABLE,
+})
+
+def _check_table(table):
+    """Raise ValueError for tables outside the CRUD whitelist"""
+    if table not in _ALLOWED_TABLES:
+        raise ValueError(f"Unknown table: {table!r}")
+
+# Identical SQL strings hit sqlite3's per-connection prepared statement cache,
+# so each (table, columns) shape is built once and then only re-bound
+@lru_cache(maxsize=64)
+def _insert_sql(table, columns):
+    """INSERT statement for a table and a tuple of column names"""
+    placeholders = ', '.join(['?'] * len(columns))
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+@lru_cache(maxsize=64)
+def _update_sql(table, columns):
+    """UPDATE-by-id statement for a table and a tuple of column names"""
+    set_clause = ', '.join([f"{column} = ?" for column in columns])
+    return f"UPDATE {table} SET {set_clause} WHERE id = ?"
+
+@lru_cache(maxsize=8)
+def _delete_sql(table):
+    """DELETE-by-id statement for a table"""
+    return f"DELETE FROM {table} WHERE id = ?"
+
+# Row counts for the dashboard metrics, one (table, count) row per table
+_TABLE_STATS_SQL = """
+    SELECT 'players', COUNT(*) FROM players
+    UNION ALL SELECT 'matches', COUNT(*) FROM matches
+    UNION ALL SELECT 'series', COUNT(*) FROM series
+    UNION ALL SELECT 'player_performances', COUNT(*) FROM player_performances
+"""
+
+# Home country of each national team, for home/away analysis
+_TEAM_HOME_COUNTRIES = (
+    ("India", "India"),
+    ("Australia", "Australia"),
+    ("England", "England"),
+    ("New Zealand", "New Zealand"),
+    ("Pakistan", "Pakistan"),
+    ("South Africa", "South Africa"),
+)
+
+# Sample players data - Comprehensive cricket team data
+_SAMPLE_PLAYERS = (
+    ("Virat Kohli", "India", "Batsman", "Right-handed", "Right-arm medium", 12000, 52.5, 43, 0, 0.0, 0.0, 89, 0, 245),
+    ("Rohit Sharma", "India", "Batsman", "Right-handed", "Right-arm off-break", 9500, 48.2, 31, 8, 35.2, 5.8, 67, 0, 227),
+    ("MS Dhoni", "India", "Wicket-keeper", "Right-handed", "Right-arm medium", 10773, 50.57, 10, 0, 0.0, 0.0, 123, 38, 350),
+    ("Ravindra Jadeja", "India", "All-rounder", "Left-handed", "Left-arm orthodox", 2635, 35.26, 0, 213, 24.63, 2.39, 78, 0, 168),
+    ("Jasprit Bumrah", "India", "Bowler", "Right-handed", "Right-arm fast", 85, 8.50, 0, 128, 20.94, 4.63, 12, 0, 64),
+    ("Steve Smith", "Australia", "Batsman", "Right-handed", "Right-arm leg-break", 8010, 61.61, 27, 17, 54.7, 3.2, 106, 0, 131),
+    ("Joe Root", "England", "Batsman", "Right-handed", "Right-arm off-break", 9500, 50.26, 24, 24, 45.8, 3.1, 89, 0, 189),
+    ("Kane Williamson", "New Zealand", "Batsman", "Right-handed", "Right-arm off-break", 7115, 54.31, 22, 8, 52.2, 3.4, 78, 0, 131),
+    ("Babar Azam", "Pakistan", "Batsman", "Right-handed", "Right-arm medium", 4442, 45.37, 13, 0, 0.0, 0.0, 56, 0, 98),
+    ("Shaheen Afridi", "Pakistan", "Bowler", "Left-handed", "Left-arm fast", 123, 12.3, 0, 89, 23.98, 4.82, 15, 0, 36),
+    ("David Warner", "Australia", "Batsman", "Left-handed", "Right-arm leg-break", 5455, 45.45, 18, 3, 42.0, 4.5, 78, 0, 120),
+    ("Pat Cummins", "Australia", "Bowler", "Right-handed", "Right-arm fast", 945, 18.9, 0, 188, 28.94, 2.8, 45, 0, 67),
+    ("Ben Stokes", "England", "All-rounder", "Left-handed", "Right-arm fast-medium", 4890, 36.0, 11, 99, 32.26, 3.2, 89, 0, 136),
+    ("Trent Boult", "New Zealand", "Bowler", "Left-handed", "Left-arm fast-medium", 234, 13.6, 0, 317, 27.49, 4.85, 56, 0, 78),
+    ("Quinton de Kock", "South Africa", "Wicket-keeper", "Left-handed", "Right-arm medium", 5440, 44.0, 15, 0, 0.0, 0.0, 134, 23, 124)
+)
+
+# Sample matches data - Diverse match scenarios
+_SAMPLE_MATCHES = (
+    ("India vs Australia, 1st ODI", "India", "Australia", "Wankhede Stadium", "Mumbai", "India", 33000, "2024-01-15", "ODI", "India", 36, "runs", "Australia", "bowl"),
+    ("England vs New Zealand, T20I", "England", "New Zealand", "Lord's", "London", "England", 28000, "2024-02-20", "T20I", "New Zealand", 5, "wickets", "England", "bat"),
+    ("Pakistan vs South Africa, Test", "Pakistan", "South Africa", "National Stadium", "Karachi", "Pakistan", 34000, "2024-03-10", "Test", "Pakistan", 7, "wickets", "Pakistan", "bat"),
+    ("India vs England, 2nd ODI", "India", "England", "Eden Gardens", "Kolkata", "India", 66000, "2024-01-28", "ODI", "England", 8, "wickets", "India", "bat"),
+    ("Australia vs West Indies, T20I", "Australia", "West Indies", "MCG", "Melbourne", "Australia", 100000, "2024-02-15", "T20I", "Australia", 42, "runs", "West Indies", "bowl"),
+    ("India vs Pakistan, T20I", "India", "Pakistan", "Dubai International Stadium", "Dubai", "UAE", 25000, "2024-03-25", "T20I", "India", 6, "wickets", "Pakistan", "bat"),
+    ("England vs Australia, Test", "England", "Australia", "The Oval", "London", "England", 27500, "2024-04-10", "Test", "Australia", 10, "wickets", "England", "bowl"),
+    ("New Zealand vs South Africa, ODI", "New Zealand", "South Africa", "Eden Park", "Auckland", "New Zealand", 42000, "2024-04-20", "ODI", "New Zealand", 23, "runs", "South Africa", "bat")
+)
+
+# Sample series data
+_SAMPLE_SERIES = (
+    ("India vs Australia ODI Series 2024", "India", "ODI", "2024-01-15", 5),
+    ("England vs New Zealand T20 Series", "England", "T20I", "2024-02-18", 3),
+    ("Pakistan vs South Africa Test Series", "Pakistan", "Test", "2024-03-08", 2),
+    ("ICC T20 World Cup 2024", "West Indies", "T20I", "2024-06-01", 55),
+    ("Asia Cup 2024", "Pakistan", "ODI", "2024-08-15", 13)
+)
+
+# Sample player performances data for advanced queries
+_SAMPLE_PERFORMANCES = (
+    (1, 1, 85, 78, 108.97, 0, 0.0, 0, 1),  # Virat Kohli in match 1
+    (2, 1, 124, 115, 107.83, 0, 0.0, 0, 2),  # Rohit Sharma in match 1
+    (5, 1, 8, 15, 53.33, 3, 8.5, 45, 11),   # Bumrah bowling in match 1
+    (1, 2, 45, 32, 140.63, 0, 0.0, 0, 3),   # Virat Kohli in match 2
+    (7, 2, 67, 89, 75.28, 0, 0.0, 0, 4),    # Joe Root in match 2
+    (13, 2, 23, 18, 127.78, 2, 3.2, 18, 6), # Ben Stokes all-round performance
+    (6, 3, 178, 234, 76.07, 0, 0.0, 0, 1),  # Steve Smith in Test match
+    (8, 4, 89, 98, 90.82, 0, 0.0, 0, 2),    # Kane Williamson
+    (9, 5, 78, 67, 116.42, 0, 0.0, 0, 3),   # Babar Azam
+    (10, 5, 12, 8, 150.0, 4, 4.0, 28, 9),   # Shaheen Afridi bowling
+)
+
+# Player performances table - Individual match performances
+_PERFORMANCES_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS player_performances (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        player_id INTEGER,
+        match_id INTEGER,
+        runs_scored INTEGER DEFAULT 0,
+        balls_faced INTEGER DEFAULT 0,
+        strike_rate REAL DEFAULT 0.0,
+        wickets_taken INTEGER DEFAULT 0,
+        overs_bowled REAL DEFAULT 0.0,
+        runs_conceded INTEGER DEFAULT 0,
+        batting_position INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (player_id) REFERENCES players(id) ON DELETE CASCADE,
+        FOREIGN KEY (match_id) REFERENCES matches(id) ON DELETE CASCADE
+    )
+"""
+
+# In-memory snapshots of freshly seeded databases keyed by absolute file path, shared by
+# every manager in the process so reset_database can restore one without re-running the DDL and inserts
+_seed_snapshots = {}
+
+# Write counters keyed by absolute file path, bumped by every CRUD write and reset
+# so result caches keyed on DatabaseManager.cache_key stop serving the old rows
+_data_versions = {}
+
+# Connection defaults for every manager: WAL journal, no fsync per commit,
+# in-memory temp storage and a 20MB page cache
+_DEFAULT_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-20000",
+)
+
+def _pd():
+    """Import pandas on first DataFrame use - count and raw-row callers never pay for it"""
+    import pandas as pd
+    return pd
+
+def _synchronized(method):
+    """Run a DatabaseManager method while holding the instance's connection lock"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class DatabaseManager:
     """
     Database Manager Class - Handles all database operations
     Following assignment requirements for SQL-based analytics
     """
     
-    def __init__(self, db_path="data/cricbuzz_analytics.db"):
-        """Initialize database connection with SQLite"""
+    def __init__(self, db_path="data/cricbuzz_analytics.db", pragmas=()):
+        """
+        Initialize database connection with SQLite
+        pragmas: PRAGMA settings (e.g. "synchronous=NORMAL") applied to every connection
+        """
         self.db_path = db_path
+        self._db_key = os.path.abspath(db_path)
+        self.pragmas = tuple(pragmas)
+        self._conn = None
+        self._lock = threading.RLock()  # serializes use of the shared connection across Streamlit threads
         self.ensure_data_directory()
         self.init_database()
     
@@ -26,13 +189,40 @@ class DatabaseManager:
         if data_dir and not os.path.exists(data_dir):
             os.makedirs(data_dir)
     
+    @_synchronized
     def get_connection(self):
         """
         Get database connection - centralized as per assignment requirements
-        Returns SQLite connection object
+        Returns the shared SQLite connection, opening it on first use
         """
-        return sqlite3.connect(self.db_path)
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA foreign_keys=ON")  # off by default on every SQLite connection
+            # Defaults first so the configured pragmas can override them
+            for pragma in _DEFAULT_PRAGMAS + self.pragmas:
+                conn.execute(f"PRAGMA {pragma}")
+            self._conn = conn
+            # Close when this manager is garbage collected or at interpreter exit
+            weakref.finalize(self, conn.close)
+        return self._conn
     
+    @property
+    def cache_key(self):
+        """(database file, write version) - changes whenever this module writes to the file"""
+        return self._db_key, _data_versions.get(self._db_key, 0)
+    
+    def _bump_data_version(self):
+        """Invalidate results cached under the current cache_key"""
+        _data_versions[self._db_key] = _data_versions.get(self._db_key, 0) + 1
+    
+    @_synchronized
+    def close(self):
+        """Close the shared connection; the next call reopens it"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    @_synchronized
     def init_database(self):
         """
         Create database tables as per cricket data structure
@@ -98,31 +288,108 @@ class DatabaseManager:
             )
         """)
         
+        # Tables created before the foreign keys cascaded keep their old definition, and a
+        # leftover player_performances_legacy is an interrupted rebuild - finish either one
+        cursor.execute("PRAGMA foreign_key_list(player_performances)")
+        legacy_performances = any(fk[6] != 'CASCADE' for fk in cursor.fetchall())
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'player_performances_legacy'")
+        leftover_legacy = cursor.fetchone() is not None
+        if legacy_performances or leftover_legacy:
+            self._rebuild_performances(conn, legacy_performances, leftover_legacy)
+        
         # Player performances table - Individual match performances
+        cursor.execute(_PERFORMANCES_TABLE_SQL)
+        
+        # Teams lookup table - maps a team to its home country
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS player_performances (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                player_id INTEGER,
-                match_id INTEGER,
-                runs_scored INTEGER DEFAULT 0,
-                balls_faced INTEGER DEFAULT 0,
-                strike_rate REAL DEFAULT 0.0,
-                wickets_taken INTEGER DEFAULT 0,
-                overs_bowled REAL DEFAULT 0.0,
-                runs_conceded INTEGER DEFAULT 0,
-                batting_position INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (player_id) REFERENCES players(id),
-                FOREIGN KEY (match_id) REFERENCES matches(id)
+            CREATE TABLE IF NOT EXISTS teams (
+                name TEXT PRIMARY KEY,
+                home_country TEXT
             )
         """)
+        cursor.executemany("INSERT OR IGNORE INTO teams (name, home_country) VALUES (?, ?)", _TEAM_HOME_COUNTRIES)
+        
+        # Indexes for the analytics workload's filters and joins. The two
+        # player_performances composites cover every column the aggregates read,
+        # so the date-filtered (match-first) and per-player (player-first) joins
+        # never touch the table itself. They supersede the narrower
+        # ix_perf_match, ix_perf_match_player and ix_perf_player_match.
+        cursor.executescript("""
+            CREATE INDEX IF NOT EXISTS ix_players_country_role ON players(country, playing_role);
+            CREATE INDEX IF NOT EXISTS ix_players_role ON players(playing_role);
+            CREATE INDEX IF NOT EXISTS ix_matches_format_date ON matches(match_format, match_date);
+            CREATE INDEX IF NOT EXISTS ix_matches_date ON matches(match_date);
+            CREATE INDEX IF NOT EXISTS ix_series_start ON series(start_date);
+            DROP INDEX IF EXISTS ix_perf_match;
+            DROP INDEX IF EXISTS ix_perf_match_player;
+            DROP INDEX IF EXISTS ix_perf_player_match;
+            CREATE INDEX IF NOT EXISTS ix_perf_match_covering
+                ON player_performances(match_id, player_id, runs_scored, balls_faced, strike_rate,
+                                       overs_bowled, runs_conceded, wickets_taken);
+            CREATE INDEX IF NOT EXISTS ix_perf_player_covering
+                ON player_performances(player_id, match_id, runs_scored, wickets_taken, balls_faced,
+                                       strike_rate, overs_bowled, runs_conceded);
+            CREATE INDEX IF NOT EXISTS ix_perf_batting_order
+                ON player_performances(match_id, batting_position, player_id, runs_scored);
+        """)
+        
+        # Databases seeded before an index existed have no planner statistics for it yet
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if cursor.fetchone() is None:
+            cursor.execute("ANALYZE")
+        else:
+            cursor.execute("""
+                SELECT 1 FROM sqlite_master
+                WHERE type = 'index' AND name LIKE 'ix%'
+                AND name NOT IN (SELECT idx FROM sqlite_stat1 WHERE idx IS NOT NULL)
+                LIMIT 1
+            """)
+            if cursor.fetchone() is not None:
+                cursor.execute("ANALYZE")
         
         conn.commit()
-        conn.close()
         
         # Insert sample data for demonstration
         self.insert_sample_data()
     
+    def _rebuild_performances(self, conn, legacy_performances, leftover_legacy):
+        """
+        Recreate player_performances with ON DELETE CASCADE, all or nothing
+        Rows are staged in player_performances_legacy; a rebuild that fails its
+        foreign-key check is rolled back and retried on the next start
+        """
+        # foreign_keys can't change inside a transaction - switch it off for the copy
+        conn.execute("PRAGMA foreign_keys=OFF")
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if legacy_performances:
+                    for index in ("ix_perf_match_covering", "ix_perf_player_covering", "ix_perf_batting_order"):
+                        conn.execute(f"DROP INDEX IF EXISTS {index}")
+                    if leftover_legacy:
+                        conn.execute("INSERT OR IGNORE INTO player_performances_legacy SELECT * FROM player_performances")
+                        conn.execute("DROP TABLE player_performances")
+                    else:
+                        conn.execute("ALTER TABLE player_performances RENAME TO player_performances_legacy")
+                
+                conn.execute(_PERFORMANCES_TABLE_SQL)
+                # OR IGNORE: an interrupted rebuild may already have copied some rows
+                conn.execute("INSERT OR IGNORE INTO player_performances SELECT * FROM player_performances_legacy")
+                conn.execute("DROP TABLE player_performances_legacy")
+                
+                violations = conn.execute("PRAGMA foreign_key_check(player_performances)").fetchall()
+                if violations:
+                    conn.execute("ROLLBACK")
+                    print(f"player_performances rebuild skipped: {len(violations)} rows reference missing players/matches")
+                    return
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.execute("PRAGMA foreign_keys=ON")
+    
+    @_synchronized
     def insert_sample_data(self):
         """
         Insert sample cricket data for demonstration and SQL practice
@@ -134,196 +401,216 @@ class DatabaseManager:
         # Check if data already exists
         cursor.execute("SELECT COUNT(*) FROM players")
         if cursor.fetchone()[0] > 0:
-            conn.close()
             return
         
-        # Sample players data - Comprehensive cricket team data
-        sample_players = [
-            ("Virat Kohli", "India", "Batsman", "Right-handed", "Right-arm medium", 12000, 52.5, 43, 0, 0.0, 0.0, 89, 0, 245),
-            ("Rohit Sharma", "India", "Batsman", "Right-handed", "Right-arm off-break", 9500, 48.2, 31, 8, 35.2, 5.8, 67, 0, 227),
-            ("MS Dhoni", "India", "Wicket-keeper", "Right-handed", "Right-arm medium", 10773, 50.57, 10, 0, 0.0, 0.0, 123, 38, 350),
-            ("Ravindra Jadeja", "India", "All-rounder", "Left-handed", "Left-arm orthodox", 2635, 35.26, 0, 213, 24.63, 2.39, 78, 0, 168),
-            ("Jasprit Bumrah", "India", "Bowler", "Right-handed", "Right-arm fast", 85, 8.50, 0, 128, 20.94, 4.63, 12, 0, 64),
-            ("Steve Smith", "Australia", "Batsman", "Right-handed", "Right-arm leg-break", 8010, 61.61, 27, 17, 54.7, 3.2, 106, 0, 131),
-            ("Joe Root", "England", "Batsman", "Right-handed", "Right-arm off-break", 9500, 50.26, 24, 24, 45.8, 3.1, 89, 0, 189),
-            ("Kane Williamson", "New Zealand", "Batsman", "Right-handed", "Right-arm off-break", 7115, 54.31, 22, 8, 52.2, 3.4, 78, 0, 131),
-            ("Babar Azam", "Pakistan", "Batsman", "Right-handed", "Right-arm medium", 4442, 45.37, 13, 0, 0.0, 0.0, 56, 0, 98),
-            ("Shaheen Afridi", "Pakistan", "Bowler", "Left-handed", "Left-arm fast", 123, 12.3, 0, 89, 23.98, 4.82, 15, 0, 36),
-            ("David Warner", "Australia", "Batsman", "Left-handed", "Right-arm leg-break", 5455, 45.45, 18, 3, 42.0, 4.5, 78, 0, 120),
-            ("Pat Cummins", "Australia", "Bowler", "Right-handed", "Right-arm fast", 945, 18.9, 0, 188, 28.94, 2.8, 45, 0, 67),
-            ("Ben Stokes", "England", "All-rounder", "Left-handed", "Right-arm fast-medium", 4890, 36.0, 11, 99, 32.26, 3.2, 89, 0, 136),
-            ("Trent Boult", "New Zealand", "Bowler", "Left-handed", "Left-arm fast-medium", 234, 13.6, 0, 317, 27.49, 4.85, 56, 0, 78),
-            ("Quinton de Kock", "South Africa", "Wicket-keeper", "Left-handed", "Right-arm medium", 5440, 44.0, 15, 0, 0.0, 0.0, 134, 23, 124)
-        ]
-        
-        cursor.executemany("""
-            INSERT INTO players (name, country, playing_role, batting_style, bowling_style, 
-                               total_runs, batting_average, centuries, wickets_taken, 
-                               bowling_average, economy_rate, catches, stumpings, matches_played)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, sample_players)
-        
-        # Sample matches data - Diverse match scenarios
-        sample_matches = [
-            ("India vs Australia, 1st ODI", "India", "Australia", "Wankhede Stadium", "Mumbai", "India", 33000, "2024-01-15", "ODI", "India", 36, "runs", "Australia", "bowl"),
-            ("England vs New Zealand, T20I", "England", "New Zealand", "Lord's", "London", "England", 28000, "2024-02-20", "T20I", "New Zealand", 5, "wickets", "England", "bat"),
-            ("Pakistan vs South Africa, Test", "Pakistan", "South Africa", "National Stadium", "Karachi", "Pakistan", 34000, "2024-03-10", "Test", "Pakistan", 7, "wickets", "Pakistan", "bat"),
-            ("India vs England, 2nd ODI", "India", "England", "Eden Gardens", "Kolkata", "India", 66000, "2024-01-28", "ODI", "England", 8, "wickets", "India", "bat"),
-            ("Australia vs West Indies, T20I", "Australia", "West Indies", "MCG", "Melbourne", "Australia", 100000, "2024-02-15", "T20I", "Australia", 42, "runs", "West Indies", "bowl"),
-            ("India vs Pakistan, T20I", "India", "Pakistan", "Dubai International Stadium", "Dubai", "UAE", 25000, "2024-03-25", "T20I", "India", 6, "wickets", "Pakistan", "bat"),
-            ("England vs Australia, Test", "England", "Australia", "The Oval", "London", "England", 27500, "2024-04-10", "Test", "Australia", 10, "wickets", "England", "bowl"),
-            ("New Zealand vs South Africa, ODI", "New Zealand", "South Africa", "Eden Park", "Auckland", "New Zealand", 42000, "2024-04-20", "ODI", "New Zealand", 23, "runs", "South Africa", "bat")
-        ]
-        
-        cursor.executemany("""
-            INSERT INTO matches (match_description, team1, team2, venue_name, venue_city, 
-                               venue_country, venue_capacity, match_date, match_format, 
-                               winning_team, victory_margin, victory_type, toss_winner, toss_decision)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, sample_matches)
-        
-        # Sample series data
-        sample_series = [
-            ("India vs Australia ODI Series 2024", "India", "ODI", "2024-01-15", 5),
-            ("England vs New Zealand T20 Series", "England", "T20I", "2024-02-18", 3),
-            ("Pakistan vs South Africa Test Series", "Pakistan", "Test", "2024-03-08", 2),
-            ("ICC T20 World Cup 2024", "West Indies", "T20I", "2024-06-01", 55),
-            ("Asia Cup 2024", "Pakistan", "ODI", "2024-08-15", 13)
-        ]
+        # Seed everything in one write transaction - a single commit instead of one per statement
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            cursor.executemany("""
+                INSERT INTO players (name, country, playing_role, batting_style, bowling_style, 
+                                   total_runs, batting_average, centuries, wickets_taken, 
+                                   bowling_average, economy_rate, catches, stumpings, matches_played)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, _SAMPLE_PLAYERS)
+            
+            cursor.executemany("""
+                INSERT INTO matches (match_description, team1, team2, venue_name, venue_city, 
+                                   venue_country, venue_capacity, match_date, match_format, 
+                                   winning_team, victory_margin, victory_type, toss_winner, toss_decision)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, _SAMPLE_MATCHES)
+            
+            cursor.executemany("""
+                INSERT INTO series (series_name, host_country, match_type, start_date, total_matches)
+                VALUES (?, ?, ?, ?, ?)
+            """, _SAMPLE_SERIES)
+            
+            cursor.executemany("""
+                INSERT INTO player_performances (player_id, match_id, runs_scored, balls_faced, 
+                                               strike_rate, wickets_taken, overs_bowled, runs_conceded, batting_position)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, _SAMPLE_PERFORMANCES)
+            
+            cursor.execute("COMMIT")
+        except Exception:
+            # Never leave the shared connection stuck inside an open write transaction
+            conn.execute("ROLLBACK")
+            raise
+        self._bump_data_version()
         
-        cursor.executemany("""
-            INSERT INTO series (series_name, host_country, match_type, start_date, total_matches)
-            VALUES (?, ?, ?, ?, ?)
-        """, sample_series)
+        # Give the query planner row statistics for the new indexes
+        cursor.execute("ANALYZE")
         
-        # Sample player performances data for advanced queries
-        sample_performances = [
-            (1, 1, 85, 78, 108.97, 0, 0.0, 0, 1),  # Virat Kohli in match 1
-            (2, 1, 124, 115, 107.83, 0, 0.0, 0, 2),  # Rohit Sharma in match 1
-            (5, 1, 8, 15, 53.33, 3, 8.5, 45, 11),   # Bumrah bowling in match 1
-            (1, 2, 45, 32, 140.63, 0, 0.0, 0, 3),   # Virat Kohli in match 2
-            (7, 2, 67, 89, 75.28, 0, 0.0, 0, 4),    # Joe Root in match 2
-            (13, 2, 23, 18, 127.78, 2, 3.2, 18, 6), # Ben Stokes all-round performance
-            (6, 3, 178, 234, 76.07, 0, 0.0, 0, 1),  # Steve Smith in Test match
-            (8, 4, 89, 98, 90.82, 0, 0.0, 0, 2),    # Kane Williamson
-            (9, 5, 78, 67, 116.42, 0, 0.0, 0, 3),   # Babar Azam
-            (10, 5, 12, 8, 150.0, 4, 4.0, 28, 9),   # Shaheen Afridi bowling
-        ]
+        if self._db_key not in _seed_snapshots:
+            snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+            conn.backup(snapshot)
+            _seed_snapshots[self._db_key] = snapshot
+    
+    @contextmanager
+    def read_transaction(self):
+        """
+        Hold the connection lock and a single read transaction across several queries
+        Each query inside sees the same snapshot instead of opening its own
+        """
+        with self._lock:
+            conn = self.get_connection()
+            if conn.in_transaction:
+                # Already inside a batch (or a write) - just join it
+                yield conn
+                return
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                conn.execute("COMMIT")
+    
+    @_synchronized
+    def execute_query_raw(self, query, params=None):
+        """
+        Execute a SQL query and return its rows as a list of tuples
+        For internal and count-style lookups that don't need a DataFrame
+        """
+        try:
+            return self.get_connection().execute(query, params or ()).fetchall()
+        except Exception as e:
+            print(f"Database query error: {e}")
+            return []
+    
+    @_synchronized
+    def fetch_df(self, query, params=None):
+        """
+        Execute a SQL query and return results as DataFrame, raising on errors
+        For callers that cache results and must not memoize a failure
+        """
+        # Plain cursor fetch - skips read_sql_query's connection inspection and per-call setup
+        cursor = self.get_connection().execute(query, params or ())
+        columns = [column[0] for column in cursor.description] if cursor.description else []
+        return _pd().DataFrame.from_records(cursor.fetchall(), columns=columns)
+    
+    @_synchronized
+    def fetch_arrow(self, query, params=None):
+        """
+        Execute a SQL query and return results as a columnar pyarrow Table, raising on errors
+        Columns are built straight from the cursor rows - no intermediate object DataFrame
+        """
+        import pyarrow as pa  # ships with streamlit; imported on first use like pandas
         
-        cursor.executemany("""
-            INSERT INTO player_performances (player_id, match_id, runs_scored, balls_faced, 
-                                           strike_rate, wickets_taken, overs_bowled, runs_conceded, batting_position)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, sample_performances)
+        cursor = self.get_connection().execute(query, params or ())
+        names = [column[0] for column in cursor.description] if cursor.description else []
+        rows = cursor.fetchall()
         
-        conn.commit()
-        conn.close()
+        arrays = []
+        for values in (zip(*rows) if rows else [()] * len(names)):
+            try:
+                arrays.append(pa.array(values))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # SQLite columns can mix storage classes; fall back to text for those
+                arrays.append(pa.array([None if v is None else str(v) for v in values]))
+        return pa.Table.from_arrays(arrays, names=names)
     
-    def execute_query(self, query, params=None):
+    def execute_query_df(self, query, params=None):
         """
         Execute a SQL query and return results as DataFrame
         Used by SQL analytics module for all 25 queries
         """
         try:
-            conn = self.get_connection()
-            if params:
-                df = pd.read_sql_query(query, conn, params=params)
-            else:
-                df = pd.read_sql_query(query, conn)
-            conn.close()
-            return df
+            return self.fetch_df(query, params)
         except Exception as e:
             print(f"Database query error: {e}")
-            return pd.DataFrame()
+            return _pd().DataFrame()
     
+    # DataFrame results remain the default for existing callers
+    execute_query = execute_query_df
+    
+    @_synchronized
     def insert_record(self, table, data):
         """
         Insert a new record into specified table
         Used by CRUD operations for Create functionality
         """
+        _check_table(table)
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            columns = ', '.join(data.keys())
-            placeholders = ', '.join(['?' for _ in data])
-            query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
-            
-            cursor.execute(query, list(data.values()))
+            cursor.execute(_insert_sql(table, tuple(data)), list(data.values()))
             record_id = cursor.lastrowid
             conn.commit()
-            conn.close()
+            self._bump_data_version()
             return record_id
         except Exception as e:
             print(f"Insert error: {e}")
             return None
     
+    @_synchronized
     def update_record(self, table, record_id, data):
         """
         Update an existing record
         Used by CRUD operations for Update functionality
         """
+        _check_table(table)
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            set_clause = ', '.join([f"{key} = ?" for key in data.keys()])
-            query = f"UPDATE {table} SET {set_clause} WHERE id = ?"
-            
-            cursor.execute(query, list(data.values()) + [record_id])
+            cursor.execute(_update_sql(table, tuple(data)), list(data.values()) + [record_id])
             rows_affected = cursor.rowcount
             conn.commit()
-            conn.close()
+            self._bump_data_version()
             return rows_affected
         except Exception as e:
             print(f"Update error: {e}")
             return 0
     
+    @_synchronized
     def delete_record(self, table, record_id):
         """
         Delete a record from specified table
         Used by CRUD operations for Delete functionality
         """
+        _check_table(table)
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            # Delete related records first if necessary
-            if table == "players":
-                cursor.execute("DELETE FROM player_performances WHERE player_id = ?", (record_id,))
-            elif table == "matches":
-                cursor.execute("DELETE FROM player_performances WHERE match_id = ?", (record_id,))
-            
-            # Delete main record
-            cursor.execute(f"DELETE FROM {table} WHERE id = ?", (record_id,))
+            # Related player_performances rows go with it via ON DELETE CASCADE
+            cursor.execute(_delete_sql(table), (record_id,))
             rows_affected = cursor.rowcount
             conn.commit()
-            conn.close()
+            self._bump_data_version()
             return rows_affected
         except Exception as e:
             print(f"Delete error: {e}")
             return 0
     
+    @_synchronized
     def get_table_stats(self):
         """
         Get statistics about all tables
         Used for dashboard metrics
         """
         try:
-            conn = self.get_connection()
-            stats = {}
-            
-            tables = ["players", "matches", "series", "player_performances"]
-            for table in tables:
-                result = pd.read_sql_query(f"SELECT COUNT(*) as count FROM {table}", conn)
-                stats[table] = result.iloc[0]['count']
-            
-            conn.close()
-            return stats
+            # All four counts in one statement and one fetch
+            return dict(self.get_connection().execute(_TABLE_STATS_SQL).fetchall())
         except Exception as e:
             print(f"Stats error: {e}")
             return {}
     
+    @_synchronized
+    def get_table_ddl(self):
+        """
+        CREATE TABLE statement of every table, as stored by SQLite
+        Used for the schema reference, so it always matches the live tables
+        """
+        try:
+            return dict(self.get_connection().execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            ).fetchall())
+        except Exception as e:
+            print(f"Schema error: {e}")
+            return {}
+    
+    @_synchronized
     def reset_database(self):
         """
         Reset database to initial state with sample data
@@ -331,6 +618,14 @@ class DatabaseManager:
         """
         try:
             conn = self.get_connection()
+            
+            seed_snapshot = _seed_snapshots.get(self._db_key)
+            if seed_snapshot is not None:
+                # Copy this database's seed snapshot over the live file in one page-level backup pass
+                seed_snapshot.backup(conn)
+                self._bump_data_version()
+                return True
+            
             cursor = conn.cursor()
             
             # Drop all tables
@@ -340,10 +635,10 @@ class DatabaseManager:
             cursor.execute("DROP TABLE IF EXISTS players")
             
             conn.commit()
-            conn.close()
             
             # Reinitialize database
             self.init_database()
+            self._bump_data_version()
             return True
         except Exception as e:
             print(f"Reset error: {e}")